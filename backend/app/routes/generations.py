@@ -2,7 +2,7 @@
 Image generation API routes
 """
 
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends, BackgroundTasks, Response
 from typing import Dict, Any
 import logging
 import os
@@ -227,8 +227,10 @@ async def generate_photoreal_images(
 
 
 @router.get("/status/{generation_id}")
-async def get_generation_status(generation_id: str):
+async def get_generation_status(generation_id: str, response: Response):
     """Get status of a generation job."""
+    # Status can change, so only allow short-lived caching
+    response.headers["Cache-Control"] = "private, max-age=2"
     # In a real implementation, you'd track job status
     return {
         "generation_id": generation_id,
@@ -2,7 +2,8 @@
 Models information API routes
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+from functools import lru_cache
 import logging
 
 from ..api import ModelsResponse, ModelInfo
@@ -13,11 +14,13 @@ from core.engine.leonardo.flux import FluxEngine
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/models", tags=["models"])
 
+# Model metadata is static for the lifetime of the process
+MODELS_CACHE_CONTROL = "public, max-age=3600"
 
-@router.get("/", response_model=ModelsResponse)
-async def list_models():
-    """List all available AI models."""
-    
+
+@lru_cache(maxsize=None)
+def _build_models_response() -> ModelsResponse:
+    """Build the list of available models once."""
     models = [
         ModelInfo(
             vendor="leonardo",
@@ -46,47 +49,69 @@ async def list_models():
     return ModelsResponse(models=models)
 
 
-@router.get("/leonardo/phoenix/styles")
-async def get_phoenix_styles():
-    """Get available styles for Phoenix model."""
+@lru_cache(maxsize=None)
+def _build_phoenix_styles() -> dict:
+    """Build the Phoenix styles payload once."""
+    styles = PhoenixEngine.get_available_styles()
     return {
         "model": "leonardo.phoenix",
+        "styles": styles,
+        "total": len(styles)
+    }
+
+
+@lru_cache(maxsize=None)
+def _build_phoenix_info() -> dict:
+    """Build the Phoenix model description once."""
+    return {
+        "vendor": "leonardo",
+        "name": "phoenix",
+        "type": "image",
+        "available": True,
+        "description": "Leonardo AI Phoenix model for high-quality image generation",
+        "capabilities": {
+            "styles": True,
+            "negative_prompts": True,
+            "upscaling": True,
+            "alchemy": True,
+            "prompt_enhancement": True
+        },
+        "parameters": {
+            "width": {"min": 512, "max": 2048, "step": 64},
+            "height": {"min": 512, "max": 2048, "step": 64},
+            "contrast": {"min": 1.0, "max": 5.0, "default": 3.5},
+            "num_images": {"min": 1, "max": 10, "default": 1}
+        },
         "styles": PhoenixEngine.get_available_styles(),
-        "total": len(PhoenixEngine.get_available_styles())
+        "cost": {
+            "base_cost_per_image": 0.02,
+            "currency": "USD",
+            "factors": ["resolution", "alchemy", "upscaling"]
+        }
     }
 
 
+@router.get("/", response_model=ModelsResponse)
+async def list_models(response: Response):
+    """List all available AI models."""
+    response.headers["Cache-Control"] = MODELS_CACHE_CONTROL
+    return _build_models_response()
+
+
+@router.get("/leonardo/phoenix/styles")
+async def get_phoenix_styles(response: Response):
+    """Get available styles for Phoenix model."""
+    response.headers["Cache-Control"] = MODELS_CACHE_CONTROL
+    return _build_phoenix_styles()
+
+
 @router.get("/{vendor}/{model}")
-async def get_model_info(vendor: str, model: str):
+async def get_model_info(vendor: str, model: str, response: Response):
     """Get detailed information about a specific model."""
     
     if vendor == "leonardo" and model == "phoenix":
-        return {
-            "vendor": vendor,
-            "name": model,
-            "type": "image",
-            "available": True,
-            "description": "Leonardo AI Phoenix model for high-quality image generation",
-            "capabilities": {
-                "styles": True,
-                "negative_prompts": True,
-                "upscaling": True,
-                "alchemy": True,
-                "prompt_enhancement": True
-            },
-            "parameters": {
-                "width": {"min": 512, "max": 2048, "step": 64},
-                "height": {"min": 512, "max": 2048, "step": 64},
-                "contrast": {"min": 1.0, "max": 5.0, "default": 3.5},
-                "num_images": {"min": 1, "max": 10, "default": 1}
-            },
-            "styles": PhoenixEngine.get_available_styles(),
-            "cost": {
-                "base_cost_per_image": 0.02,
-                "currency": "USD",
-                "factors": ["resolution", "alchemy", "upscaling"]
-            }
-        }
+        response.headers["Cache-Control"] = MODELS_CACHE_CONTROL
+        return _build_phoenix_info()
     
     return {
         "error": f"Model {vendor}.{model} not found",
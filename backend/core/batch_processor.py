@@ -8,13 +8,18 @@ import csv
 import logging
 import time
 import uuid
+import weakref
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Iterator
 from dataclasses import dataclass
 from datetime import datetime
 
-from .schemas import GenerationRequest, GenerationResult
+import orjson
+
+from .schemas import GenerationRequest
 from .engine.base import ImageGenerationEngine
+from .modules.file_manager import write_file_async
 from .modules.image_generation_workflow import BatchImageGenerationWorkflow, ImageGenerationRequestFactory
 from .naming import GenerationNaming, NamingConfig, URLGeneration
 
@@ -22,6 +27,48 @@ from .naming import GenerationNaming, NamingConfig, URLGeneration
 logger = logging.getLogger(__name__)
 
 
+# Leonardo limits concurrent generations per account, so every batch running
+# in this process shares one in-flight limit
+MAX_CONCURRENT_GENERATIONS = 10
+# One semaphore per event loop: on Python 3.9 a semaphore is bound to the loop
+# it was created in and can't be used from another one (e.g. a second asyncio.run)
+_generation_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def get_generation_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore bounding in-flight generations on the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _generation_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _generation_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+    return semaphore
+
+
+def iter_csv_chunks(csv_path: str, chunk_size: int = 256) -> Iterator[List[Dict[str, str]]]:
+    """
+    Stream rows of a prompt CSV in chunks instead of reading the whole file.
+    
+    Args:
+        csv_path: Path to CSV file with a 'prompt' column
+        chunk_size: Maximum number of rows per chunk
+        
+    Yields:
+        Lists of up to chunk_size row dicts
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        
+        fieldnames = reader.fieldnames or []
+        if 'prompt' not in fieldnames:
+            raise ValueError("CSV must contain 'prompt' column")
+        
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            yield rows
+
+
 @dataclass
 class BatchJob:
     """Represents a single batch job."""
@@ -45,6 +92,7 @@ class BatchConfig:
     max_concurrent_requests: int = 10
     wait_timeout: int = 300  # 5 minutes timeout per request
     retry_attempts: int = 2
+    min_request_interval: float = 0.1  # Minimum seconds between job starts, for API rate limiting
     output_dir: str = NamingConfig.BASE_OUTPUT_DIR  # Use unified directory by default
     save_images: bool = True
     progress_callback: Optional[Callable[[int, int, str], None]] = None
@@ -58,9 +106,13 @@ class BatchProcessor:
         self.engine = engine
         self.config = config
         self.use_enhanced_naming = use_enhanced_naming
-        self.jobs: List[BatchJob] = []
-        self.current_batch: List[BatchJob] = []
-        self.completed_jobs: List[BatchJob] = []
+        # Jobs are streamed from the CSV while processing, so only counters and
+        # the failed jobs (for the summary) are kept in memory
+        self.csv_path: Optional[str] = None
+        self.total_jobs = 0
+        self.processing_count = 0
+        self.completed_count = 0
+        self._next_start_time = 0.0
         self.failed_jobs: List[BatchJob] = []
         self.current_progress_callback: Optional[Callable[[int, int, str], None]] = None  # 🔥 FIX: Add progress callback
         
@@ -91,40 +143,40 @@ class BatchProcessor:
         """
         Load prompts from CSV file.
         
+        Only validates and counts the prompts; the jobs themselves are created
+        from the file while the batch is processed.
+        
         Args:
             csv_path: Path to CSV file with prompts
             
         Returns:
             Number of jobs loaded
         """
-        jobs_loaded = 0
-        
         try:
-            with open(csv_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                
-                # 🔥 FIX: Check fieldnames exist and contain 'prompt'
-                fieldnames = reader.fieldnames or []
-                if 'prompt' not in fieldnames:
-                    raise ValueError("CSV must contain 'prompt' column")
-                
-                for i, row in enumerate(reader):
-                    prompt = row['prompt'].strip().strip('"')
-                    if prompt:
-                        job = BatchJob(
-                            id=f"job_{i+1:03d}",
-                            prompt=prompt
-                        )
-                        self.jobs.append(job)
-                        jobs_loaded += 1
-                        
-                logger.info(f"Loaded {jobs_loaded} jobs from {csv_path}")
+            self.csv_path = csv_path
+            self.total_jobs = sum(len(jobs) for jobs in self._iter_job_chunks())
+            logger.info(f"Loaded {self.total_jobs} jobs from {csv_path}")
                         
         except Exception as e:
             logger.error(f"Failed to load CSV: {e}")
             raise
             
-        return jobs_loaded
+        return self.total_jobs
+    
+    def _iter_job_chunks(self) -> Iterator[List[BatchJob]]:
+        """Create jobs from the loaded CSV chunk by chunk as it is read."""
+        row_index = 0
+        for rows in iter_csv_chunks(self.csv_path):
+            jobs = []
+            for row in rows:
+                row_index += 1
+                prompt = row['prompt'].strip().strip('"')
+                if prompt:
+                    jobs.append(BatchJob(
+                        id=f"job_{row_index:03d}",
+                        prompt=prompt
+                    ))
+            yield jobs
     
     async def process_batch(self, 
                           generation_params: Dict[str, Any],
@@ -141,10 +193,11 @@ class BatchProcessor:
         Returns:
             Summary of batch processing results
         """
-        if not self.jobs:
+        if not self.total_jobs:
             raise ValueError("No jobs loaded. Use load_csv() first.")
         
-        logger.info(f"Starting batch processing of {len(self.jobs)} jobs")
+        total_jobs = self.total_jobs
+        logger.info(f"Starting batch processing of {total_jobs} jobs")
         start_time = datetime.now()
         
         # Initialize enhanced batch structure if using enhanced naming
@@ -160,42 +213,61 @@ class BatchProcessor:
             # Use passed engine_type parameter or detected type
             actual_engine_type = engine_type if engine_type != "phoenix" else detected_engine_type
             
-            batch_description = f"Batch processing {len(self.jobs)} prompts"
+            batch_description = f"Batch processing {total_jobs} prompts"
             batch_structure = GenerationNaming.create_batch_generation_structure(
-                self.batch_id, len(self.jobs), actual_engine_type, batch_description
+                self.batch_id, total_jobs, actual_engine_type, batch_description
             )
             self.batch_dir = Path(batch_structure["batch_directory"])
             logger.info(f"Created enhanced batch structure: {self.batch_dir}")
         else:
             # Legacy workflow initialization
-            batch_description = f"Batch processing {len(self.jobs)} prompts"
+            batch_description = f"Batch processing {total_jobs} prompts"
             batch_structure = self.batch_workflow.initialize_batch(
-                len(self.jobs), engine_type, batch_description
+                total_jobs, engine_type, batch_description
             )
             logger.info(f"Created batch structure: {batch_structure['batch_dir']}")
         
         # Reset counters
-        self.completed_jobs = []
+        self.processing_count = 0
+        self.completed_count = 0
         self.failed_jobs = []
         
-        total_jobs = len(self.jobs)
-        
         # Store progress callback for use in job processing
         self.current_progress_callback = progress_callback or self.config.progress_callback
         
-        # Process jobs in batches of max_concurrent_requests
-        for i in range(0, len(self.jobs), self.config.max_concurrent_requests):
-            batch = self.jobs[i:i + self.config.max_concurrent_requests]
-            
-            logger.info(f"Processing batch {i//self.config.max_concurrent_requests + 1}: jobs {i+1}-{min(i+len(batch), total_jobs)}")
-            
-            # Process current batch concurrently
-            await self._process_batch_concurrent(batch, generation_params)
-            
-            # Wait for all images to be downloaded before proceeding
-            await self._wait_for_downloads(batch)
-            
-            logger.info(f"Batch completed. {len([j for j in batch if j.status == 'completed'])} successful, {len([j for j in batch if j.status == 'failed'])} failed")
+        # Feed jobs through a queue so a fixed pool of workers keeps up to
+        # max_concurrent_requests generations in flight, instead of waiting
+        # for the slowest job of each fixed-size chunk. The queue is bounded,
+        # so jobs are read from the CSV only as fast as workers take them
+        num_workers = min(self.config.max_concurrent_requests, total_jobs)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=num_workers)
+        logger.info(f"Processing {total_jobs} jobs with {num_workers} workers")
+        
+        async def feed_jobs():
+            job_chunks = self._iter_job_chunks()
+            try:
+                while True:
+                    # Read the CSV in a thread so file IO never blocks the event loop
+                    jobs = await asyncio.to_thread(next, job_chunks, None)
+                    if jobs is None:
+                        break
+                    for job in jobs:
+                        await queue.put(job)
+            finally:
+                # One stop marker per worker, also if reading the CSV failed
+                for _ in range(num_workers):
+                    await queue.put(None)
+        
+        # Workers share one start schedule, so generation requests stay spaced out
+        # for API rate limiting even while all workers are busy
+        start_lock = asyncio.Lock()
+        self._next_start_time = 0.0
+        
+        workers = [
+            asyncio.create_task(self._job_worker(queue, generation_params, start_lock))
+            for _ in range(num_workers)
+        ]
+        await asyncio.gather(feed_jobs(), *workers)
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -209,7 +281,7 @@ class BatchProcessor:
         summary = {
             "batch_id": self.batch_id,
             "total_jobs": total_jobs,
-            "completed": len(self.completed_jobs),
+            "completed": self.completed_count,
             "failed": len(self.failed_jobs),
             "duration_seconds": duration,
             "start_time": start_time.isoformat(),
@@ -226,19 +298,38 @@ class BatchProcessor:
         
         return summary
     
-    async def _process_batch_concurrent(self, batch: List[BatchJob], generation_params: Dict[str, Any]):
-        """Process a batch of jobs concurrently."""
-        tasks = []
-        
-        for job in batch:
-            task = asyncio.create_task(self._process_single_job(job, generation_params))
-            tasks.append(task)
-        
-        # Wait for all tasks to complete
-        await asyncio.gather(*tasks, return_exceptions=True)
+    async def _job_worker(self, queue: asyncio.Queue, generation_params: Dict[str, Any], start_lock: asyncio.Lock):
+        """Process jobs from the queue until a stop marker (None) arrives."""
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+            
+            await self._wait_for_start_slot(start_lock)
+            try:
+                await self._process_single_job(job, generation_params)
+            except Exception as e:
+                logger.error(f"Unexpected error processing {job.id}: {e}")
+    
+    async def _wait_for_start_slot(self, start_lock: asyncio.Lock):
+        """Wait until at least min_request_interval has passed since the last job start."""
+        async with start_lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_start_time - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start_time = loop.time() + self.config.min_request_interval
     
     async def _process_single_job(self, job: BatchJob, generation_params: Dict[str, Any]):
         """Process a single job with retry logic."""
+        self.processing_count += 1
+        try:
+            await self._run_job(job, generation_params)
+        finally:
+            self.processing_count -= 1
+    
+    async def _run_job(self, job: BatchJob, generation_params: Dict[str, Any]):
+        """Run a job's generation attempts and record the outcome."""
         job.status = "processing"
         job.start_time = datetime.now()
         
@@ -266,29 +357,34 @@ class BatchProcessor:
                     )
                     
                     # Generate images using the engine
-                    result = await self.engine.generate(request)
+                    async with get_generation_semaphore():
+                        result = await self.engine.generate(request)
                     
                     # Save images using the structured approach
                     job.image_urls = []
+                    writes = []
                     for i, image_data in enumerate(result.outputs):
                         image_info = job_structure["images"][i] if i < len(job_structure["images"]) else {
                             "path": job_structure["job_directory"] / f"image_{i+1:03d}.png",
                             "url": URLGeneration.path_to_url(job_structure["job_directory"] / f"image_{i+1:03d}.png")
                         }
                         
-                        # Save image
-                        Path(image_info["path"]).write_bytes(image_data)
+                        writes.append(write_file_async(Path(image_info["path"]), image_data))
                         job.image_urls.append(image_info["url"])
                     
+                    # Save images without blocking other jobs on the event loop
+                    await asyncio.gather(*writes)
+                    
                     job.generation_id = result.metadata.generation_id
                     job.status = "completed"
                     
                 else:
                     # Use enhanced workflow for job processing
-                    job_result = await self.batch_workflow.process_single_job(
-                        job.id, request, engine_type,
-                        lambda msg: logger.info(f"{job.id}: {msg}")
-                    )
+                    async with get_generation_semaphore():
+                        job_result = await self.batch_workflow.process_single_job(
+                            job.id, request, engine_type,
+                            lambda msg: logger.info(f"{job.id}: {msg}")
+                        )
                     
                     job.generation_id = job_result.get("generation_id")
                     job.image_urls = job_result.get("image_paths", [])
@@ -296,13 +392,13 @@ class BatchProcessor:
                 
                 job.end_time = datetime.now()
                 
-                self.completed_jobs.append(job)
+                self.completed_count += 1
                 logger.info(f"✅ {job.id} completed: {len(job.image_urls or [])} images generated")  # 🔥 FIX: Handle None case
                 
                 # 🔥 FIX: Update progress for each completed job
                 if hasattr(self, 'current_progress_callback') and self.current_progress_callback:
-                    total_completed = len(self.completed_jobs) + len(self.failed_jobs)
-                    total_jobs = len(self.jobs)
+                    total_completed = self.completed_count + len(self.failed_jobs)
+                    total_jobs = self.total_jobs
                     progress_message = f"Completed {job.id} ({total_completed}/{total_jobs})"
                     self.current_progress_callback(total_completed, total_jobs, progress_message)
                 
@@ -321,8 +417,8 @@ class BatchProcessor:
                     
                     # 🔥 FIX: Update progress for each failed job
                     if hasattr(self, 'current_progress_callback') and self.current_progress_callback:
-                        total_completed = len(self.completed_jobs) + len(self.failed_jobs)
-                        total_jobs = len(self.jobs)
+                        total_completed = self.completed_count + len(self.failed_jobs)
+                        total_jobs = self.total_jobs
                         progress_message = f"Failed {job.id} ({total_completed}/{total_jobs})"
                         self.current_progress_callback(total_completed, total_jobs, progress_message)
                     
@@ -336,46 +432,21 @@ class BatchProcessor:
         engine_type = str(type(self.engine)).lower()
         return ImageGenerationRequestFactory.from_batch_params(prompt, params, engine_type)
     
-    async def _save_job_images(self, job: BatchJob, result: GenerationResult) -> List[str]:
-        """Save images from generation result and return file paths."""
-        image_paths = []
-        
-        job_dir = self.output_path / job.id
-        job_dir.mkdir(exist_ok=True)
-        
-        for i, image_data in enumerate(result.outputs):
-            filename = f"{job.id}_image_{i+1:02d}.png"
-            filepath = job_dir / filename
-            
-            # Write image data to file
-            filepath.write_bytes(image_data)
-            image_paths.append(str(filepath))
-            
-        return image_paths
-    
-    async def _wait_for_downloads(self, batch: List[BatchJob]):
-        """Wait for all downloads in batch to complete."""
-        # Since we're processing synchronously in _save_job_images, 
-        # this is mainly for API rate limiting compliance
-        await asyncio.sleep(1)  # Small delay between batches
-    
     async def _save_summary(self, summary: Dict[str, Any]):
         """Save batch processing summary to file."""
         summary_file = self.output_path / f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
-        import json
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        summary_file.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
         
         logger.info(f"Summary saved to {summary_file}")
     
     def get_status(self) -> Dict[str, Any]:
         """Get current processing status."""
+        finished = self.completed_count + len(self.failed_jobs)
         return {
-            "total_jobs": len(self.jobs),
-            "pending": len([j for j in self.jobs if j.status == "pending"]),
-            "processing": len([j for j in self.jobs if j.status == "processing"]),
-            "completed": len(self.completed_jobs),
-            "failed": len(self.failed_jobs),
-            "current_batch_size": len(self.current_batch)
+            "total_jobs": self.total_jobs,
+            "pending": self.total_jobs - finished - self.processing_count,
+            "processing": self.processing_count,
+            "completed": self.completed_count,
+            "failed": len(self.failed_jobs)
         }
@@ -3,6 +3,7 @@ Leonardo FLUX Image Generation Engine
 Framework-agnostic business logic for Leonardo AI FLUX model.
 """
 
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional, cast
 from pathlib import Path
@@ -13,7 +14,7 @@ from ...schemas import (
     LeonardoEngineConfig,
     GenerationRequest
 )
-from services.leonardo_client import LeonardoClient, LeonardoAPIError
+from services.leonardo_client import LeonardoAPIError, get_client
 from ..base import ImageGenerationEngine
 
 
@@ -58,7 +59,7 @@ class FluxEngine(ImageGenerationEngine):
         super().__init__(config)
         
         # Create Leonardo client
-        self.client = LeonardoClient(
+        self.client = get_client(
             api_key=config.api_key,
             base_url=config.base_url,
             timeout=config.timeout,
@@ -114,13 +115,13 @@ class FluxEngine(ImageGenerationEngine):
             self.logger.debug(f"Request parameters: {leonardo_request}")
             
             # Create generation
-            generation_id = self.client.create_generation(leonardo_request)
+            generation_id = await asyncio.to_thread(self.client.create_generation, leonardo_request)
             
             # Poll until complete
-            generation_data = self.client.poll_generation(generation_id)
+            generation_data = await asyncio.to_thread(self.client.poll_generation, generation_id)
             
             # Download images
-            images = self._download_images(generation_data)
+            images = await asyncio.to_thread(self._download_images, generation_data)
             
             # Create metadata
             metadata = self.create_metadata(
@@ -174,20 +175,12 @@ class FluxEngine(ImageGenerationEngine):
     
     def _download_images(self, generation_data: Dict[str, Any]) -> List[bytes]:
         """Download all generated images."""
-        images = []
         generated_images = generation_data.get("generated_images", [])
         
         self.logger.info(f"Downloading {len(generated_images)} images...")
         
-        for img_data in generated_images:
-            image_url = img_data.get("url")
-            if image_url:
-                try:
-                    image_bytes = self.client.download_image(image_url)
-                    images.append(image_bytes)
-                except LeonardoAPIError as e:
-                    self.logger.warning(f"Failed to download image: {e}")
-                    continue
+        image_urls = [img_data["url"] for img_data in generated_images if img_data.get("url")]
+        images = self.client.download_images(image_urls)
         
         if not images:
             raise LeonardoAPIError(0, "No images could be downloaded")
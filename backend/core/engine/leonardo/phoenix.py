@@ -3,8 +3,12 @@ Leonardo Phoenix Image Generation Engine
 Framework-agnostic business logic for Leonardo AI Phoenix model.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional, cast
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, cast
 from pathlib import Path
 
 from ...schemas import (
@@ -13,7 +17,7 @@ from ...schemas import (
     LeonardoEngineConfig,
     GenerationRequest
 )
-from services.leonardo_client import LeonardoClient, LeonardoAPIError
+from services.leonardo_client import LeonardoAPIError, get_client
 from ..base import ImageGenerationEngine
 
 
@@ -23,7 +27,7 @@ logger = logging.getLogger(__name__)
 # Phoenix Model Constants
 PHOENIX_MODEL_ID = "de7d3faf-762f-48e0-b3b7-9d0ac3a3fcf3"
 
-PHOENIX_STYLES = {
+_PHOENIX_STYLE_UUIDS = {
     "3D Render": "debdf72a-91a4-467b-bf61-cc02bdeb69c6",
     "Bokeh": "9fdc5e8c-4d13-49b4-9ce6-5a74cbb19177",
     "Cinematic": "a5632c7c-ddbb-4e2f-ba34-8456ab3ac436",
@@ -51,6 +55,52 @@ PHOENIX_STYLES = {
     "Vibrant": "dee282d3-891f-4f73-ba02-7f8131e5541b"
 }
 
+# Read-only view so the table can be shared freely; keys are interned because
+# names containing spaces are not interned automatically
+PHOENIX_STYLES: Mapping[str, str] = MappingProxyType(
+    {sys.intern(name): uuid for name, uuid in _PHOENIX_STYLE_UUIDS.items()}
+)
+
+
+@lru_cache(maxsize=128)
+def _payload_template(
+    num_outputs: int,
+    width: int,
+    height: int,
+    contrast: float,
+    alchemy: bool,
+    enhance_prompt: bool,
+    style: Optional[str],
+    ultra: bool,
+    upscale: bool,
+    upscale_strength: float
+) -> Mapping[str, Any]:
+    """Build the prompt-independent part of a Phoenix payload."""
+    template: Dict[str, Any] = {
+        "modelId": PHOENIX_MODEL_ID,
+        "num_images": num_outputs,  # Leonardo API expects 'num_images'
+        "width": width,
+        "height": height,
+        "contrast": contrast,
+        "alchemy": alchemy,
+        "enhancePrompt": enhance_prompt  # Leonardo API expects 'enhancePrompt'
+    }
+    
+    # Add optional parameters
+    if style and style in PHOENIX_STYLES:
+        template["styleUUID"] = PHOENIX_STYLES[style]
+    
+    # Add ultra mode if enabled
+    if ultra:
+        template["ultra"] = ultra
+    
+    # Only include upscale parameters if upscaling is enabled
+    if upscale:
+        template["upscaleRatio"] = 2
+        template["upscaleStrength"] = upscale_strength
+    
+    return MappingProxyType(template)
+
 
 class PhoenixEngine(ImageGenerationEngine):
     """Leonardo AI Phoenix model generation engine."""
@@ -60,7 +110,7 @@ class PhoenixEngine(ImageGenerationEngine):
         super().__init__(config)
         
         # Create Leonardo client
-        self.client = LeonardoClient(
+        self.client = get_client(
             api_key=config.api_key,
             base_url=config.base_url,
             timeout=config.timeout,
@@ -110,13 +160,13 @@ class PhoenixEngine(ImageGenerationEngine):
         
         try:
             # Create generation
-            generation_id = self.client.create_generation(payload)
+            generation_id = await asyncio.to_thread(self.client.create_generation, payload)
             
             # Poll until complete
-            generation_data = self.client.poll_generation(generation_id)
+            generation_data = await asyncio.to_thread(self.client.poll_generation, generation_id)
             
             # Download images
-            images = self._download_images(generation_data)
+            images = await asyncio.to_thread(self._download_images, generation_data)
             
             # Create metadata
             metadata = self.create_metadata(
@@ -141,51 +191,35 @@ class PhoenixEngine(ImageGenerationEngine):
     
     def _build_payload(self, request: LeonardoPhoenixRequest) -> Dict[str, Any]:
         """Build Leonardo API payload from request."""
-        payload = {
-            "modelId": PHOENIX_MODEL_ID,
-            "prompt": request.prompt,
-            "num_images": request.num_outputs,  # Leonardo API expects 'num_images'
-            "width": request.width,
-            "height": request.height,
-            "contrast": request.contrast,
-            "alchemy": request.alchemy,
-            "enhancePrompt": request.enhance_prompt  # Leonardo API expects 'enhancePrompt'
-        }
-        
-        # Add optional parameters
-        if request.style and request.style in PHOENIX_STYLES:
-            payload["styleUUID"] = PHOENIX_STYLES[request.style]
+        # Everything except the prompts is shared by all requests with the
+        # same settings (e.g. every row of a batch), so reuse that part
+        payload = dict(_payload_template(
+            request.num_outputs,
+            request.width,
+            request.height,
+            request.contrast,
+            request.alchemy,
+            request.enhance_prompt,
+            request.style,
+            request.ultra,
+            request.upscale,
+            request.upscale_strength
+        ))
+        payload["prompt"] = request.prompt
         
         if request.negative_prompt:
             payload["negativePrompt"] = request.negative_prompt
         
-        # Add ultra mode if enabled
-        if request.ultra:
-            payload["ultra"] = request.ultra
-        
-        # Only include upscale parameters if upscaling is enabled
-        if request.upscale:
-            payload["upscaleRatio"] = 2
-            payload["upscaleStrength"] = request.upscale_strength
-        
         return payload
     
     def _download_images(self, generation_data: Dict[str, Any]) -> List[bytes]:
         """Download all generated images."""
-        images = []
         generated_images = generation_data.get("generated_images", [])
         
         self.logger.info(f"Downloading {len(generated_images)} images...")
         
-        for img_data in generated_images:
-            image_url = img_data.get("url")
-            if image_url:
-                try:
-                    image_bytes = self.client.download_image(image_url)
-                    images.append(image_bytes)
-                except LeonardoAPIError as e:
-                    self.logger.warning(f"Failed to download image: {e}")
-                    continue
+        image_urls = [img_data["url"] for img_data in generated_images if img_data.get("url")]
+        images = self.client.download_images(image_urls)
         
         if not images:
             raise LeonardoAPIError(0, "No images could be downloaded")
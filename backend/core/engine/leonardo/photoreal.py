@@ -3,6 +3,7 @@ Leonardo PhotoReal Image Generation Engine
 Framework-agnostic business logic for Leonardo AI PhotoReal model.
 """
 
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional, cast
 
@@ -12,7 +13,7 @@ from ...schemas import (
     LeonardoEngineConfig,
     GenerationRequest
 )
-from services.leonardo_client import LeonardoClient, LeonardoAPIError
+from services.leonardo_client import LeonardoAPIError, get_client
 from ..base import ImageGenerationEngine
 
 
@@ -61,7 +62,7 @@ class LeonardoPhotoRealEngine(ImageGenerationEngine):
     def __init__(self, config: LeonardoEngineConfig):
         """Initialize the PhotoReal engine with configuration."""
         super().__init__(config)
-        self.client = LeonardoClient(
+        self.client = get_client(
             api_key=config.api_key,
             base_url=config.base_url,
             timeout=config.timeout,
@@ -131,14 +132,7 @@ class LeonardoPhotoRealEngine(ImageGenerationEngine):
             )
             
             # Download images
-            images = []
-            for url in result.image_urls:
-                try:
-                    image_bytes = self.client.download_image(url)
-                    images.append(image_bytes)
-                except Exception as e:
-                    logger.warning(f"Failed to download image: {e}")
-                    continue
+            images = await asyncio.to_thread(self.client.download_images, result.image_urls)
             
             if not images:
                 raise LeonardoAPIError(0, "No images could be downloaded")
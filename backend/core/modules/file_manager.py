@@ -3,15 +3,23 @@ Enhanced File Management Module
 Handles improved naming conventions and metadata storage for generated images.
 """
 
-import json
 import re
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 from datetime import datetime
 
+import aiofiles
+import orjson
+
 from ..schemas import GenerationRequest, GenerationResult
 
 
+async def write_file_async(path: Path, data: bytes) -> None:
+    """Write bytes to a file without blocking the event loop."""
+    async with aiofiles.open(path, "wb") as f:
+        await f.write(data)
+
+
 class FileNamingManager:
     """Manages enhanced file naming conventions with timestamps and metadata."""
     
@@ -262,8 +270,7 @@ class MetadataManager:
     def save_metadata(metadata: Dict[str, Any], filepath: Path) -> None:
         """Save metadata to JSON file."""
         filepath.parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        filepath.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
     
     @staticmethod
     def load_metadata(filepath: Path) -> Optional[Dict[str, Any]]:
@@ -272,8 +279,7 @@ class MetadataManager:
             return None
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return orjson.loads(filepath.read_bytes())
         except Exception as e:
             print(f"Error loading metadata from {filepath}: {e}")
             return None
@@ -3,6 +3,7 @@ Image Generation Workflow Module
 Shared logic for image generation processes across the application.
 """
 
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional, Callable
 from pathlib import Path
@@ -10,7 +11,7 @@ from datetime import datetime
 
 from ..schemas import GenerationRequest, GenerationResult, LeonardoEngineConfig
 from ..engine.base import ImageGenerationEngine
-from .file_manager import EnhancedFileManager
+from .file_manager import EnhancedFileManager, write_file_async
 from ..naming import GenerationNaming, URLGeneration, NamingConfig
 
 
@@ -81,7 +82,7 @@ class ImageGenerationWorkflow:
             }
         else:
             # Legacy saving method
-            image_paths = self._save_images(
+            image_paths = await self._save_images(
                 result, 
                 output_subdir=output_subdir,
                 filename_prefix=filename_prefix
@@ -100,7 +101,7 @@ class ImageGenerationWorkflow:
                 "cost_estimate": result.metadata.cost_estimate
             }
     
-    def _save_images(
+    async def _save_images(
         self, 
         result: GenerationResult, 
         output_subdir: Optional[str] = None,
@@ -119,12 +120,11 @@ class ImageGenerationWorkflow:
             filename_prefix = result.metadata.generation_id
         
         # Save each image
-        image_paths = []
-        for i, image_data in enumerate(result.outputs):
-            filename = f"{filename_prefix}_{i+1}.png"
-            filepath = output_dir / filename
-            filepath.write_bytes(image_data)
-            image_paths.append(str(filepath))
+        saved_paths = [output_dir / f"{filename_prefix}_{i+1}.png" for i in range(len(result.outputs))]
+        await asyncio.gather(*(
+            write_file_async(path, image_data) for path, image_data in zip(saved_paths, result.outputs)
+        ))
+        image_paths = [str(path) for path in saved_paths]
             
         logger.info(f"Saved {len(image_paths)} images to {output_dir}")
         return image_paths
@@ -223,11 +223,13 @@ class BatchImageGenerationWorkflow:
                 job_dir.mkdir(exist_ok=True)
                 
                 image_paths = []
+                writes = []
                 for i, image_data in enumerate(result.outputs):
                     filename = f"{job_id}_image_{i+1:02d}.png"
                     filepath = job_dir / filename
-                    filepath.write_bytes(image_data)
+                    writes.append(write_file_async(filepath, image_data))
                     image_paths.append(str(filepath))
+                await asyncio.gather(*writes)
                 
                 end_time = datetime.now()
                 
@@ -3,6 +3,7 @@ Core schemas for AI generation parameters and responses.
 Framework-agnostic Pydantic models for domain logic.
 """
 
+import os
 from typing import Optional, List, Literal, Any, Dict
 from pydantic import BaseModel, Field, field_validator, model_validator
 from pathlib import Path
@@ -155,10 +156,19 @@ class GenerationResult(BaseModel):
         """Save all outputs to files and return paths."""
         output_dir.mkdir(parents=True, exist_ok=True)
         saved_paths = []
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
         
         for i, output_data in enumerate(self.outputs):
             filename = output_dir / f"{prefix}_{i+1}.png"
-            filename.write_bytes(output_data)
+            
+            # Raw fd write avoids pathlib's open/wrapper overhead per image
+            fd = os.open(filename, flags, 0o644)
+            try:
+                view = memoryview(output_data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
             saved_paths.append(filename)
             
         return saved_paths
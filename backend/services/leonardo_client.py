@@ -3,16 +3,41 @@ Leonardo AI HTTP Service Client
 Thin wrapper around Leonardo.ai REST API.
 """
 
+import asyncio
 import time
 import logging
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 
+__all__ = ["LeonardoAPIError", "LeonardoClient", "PhotoRealResult", "get_client"]
+
 logger = logging.getLogger(__name__)
 
 
+# Terminal generation states; anything else is still in progress
+_TERMINAL_OK = frozenset({"COMPLETE"})
+_TERMINAL_FAIL = frozenset({"FAILED", "FAILED_MODERATION", "CANCELLED", "DELETED"})
+
+# Maximum number of bytes of a non-JSON error body kept for error messages
+ERROR_BODY_LIMIT = 512
+
+# Seconds to reuse a /me response before fetching it again
+USER_INFO_TTL = 60
+
+# PhotoReal cost per output pixel, normalized from the per-megapixel base price
+_PHOTOREAL_COST_PER_PIXEL = {
+    "v1": 0.02 / (1024 * 1024),
+    "v2": 0.025 / (1024 * 1024),  # v2 costs slightly more
+}
+
+
 class LeonardoAPIError(Exception):
     """Leonardo AI API specific errors."""
     
@@ -23,6 +48,40 @@ class LeonardoAPIError(Exception):
         super().__init__(f"Leonardo API error {status_code}: {message}")
 
 
+class _MethodRetryAdapter(HTTPAdapter):
+    """HTTP adapter that sends POST requests through a separate retry policy."""
+    
+    def __init__(self, post_retries: Retry, **kwargs):
+        super().__init__(**kwargs)
+        self._post_adapter = HTTPAdapter(
+            pool_connections=kwargs.get("pool_connections", 10),
+            pool_maxsize=kwargs.get("pool_maxsize", 10),
+            max_retries=post_retries
+        )
+    
+    def send(self, request, **kwargs):
+        if request.method == "POST":
+            return self._post_adapter.send(request, **kwargs)
+        return super().send(request, **kwargs)
+    
+    def close(self):
+        super().close()
+        self._post_adapter.close()
+
+
+class PhotoRealResult:
+    """Result of a PhotoReal generation job."""
+    
+    __slots__ = ("generation_id", "status", "image_urls", "metadata", "cost_estimate")
+    
+    def __init__(self, generation_id: str, image_urls: List[str], metadata: Dict[str, Any], cost_estimate: float):
+        self.generation_id = generation_id
+        self.status = "complete"
+        self.image_urls = image_urls
+        self.metadata = metadata
+        self.cost_estimate = cost_estimate
+
+
 class LeonardoClient:
     """HTTP client for Leonardo AI API."""
     
@@ -46,7 +105,50 @@ class LeonardoClient:
             "Authorization": f"Bearer {self.api_key}",
             "Accept": "application/json",
             "Content-Type": "application/json",
+            "Connection": "keep-alive",
+        })
+        
+        # Larger connection pool and server-side backoff for rate limits / gateway errors
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        # POST /generations is not idempotent: only retry when the request was
+        # refused (connect errors, 429/503), never after it may have been processed
+        post_retry = Retry(
+            total=5,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=(429, 503),
+            allowed_methods=frozenset(["POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = _MethodRetryAdapter(
+            post_retry, pool_connections=32, pool_maxsize=32, max_retries=retry
+        )
+        self.session.mount("https://", adapter)
+        
+        # Separate pooled session for CDN image downloads, without the API bearer token
+        self._cdn_session = requests.Session()
+        self._cdn_session.headers.update({
+            "Accept": "image/*",
+            "Connection": "keep-alive",
         })
+        self._cdn_session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry)
+        )
+        
+        # Image downloads are IO-bound, so fetch them concurrently
+        self._download_pool = ThreadPoolExecutor(max_workers=8)
+        
+        # Cached /me response as (expires_at, data)
+        self._user_info_cache: Optional[Tuple[float, Dict[str, Any]]] = None
         
         logger.info(f"Leonardo client initialized with base URL: {base_url}")
     
@@ -59,10 +161,7 @@ class LeonardoClient:
             response = self.session.request(method, url, timeout=timeout, **kwargs)
             
             if response.status_code >= 400:
-                try:
-                    error_data = response.json()
-                except:
-                    error_data = {"error": response.text}
+                error_data = self._parse_error_response(response)
                 
                 raise LeonardoAPIError(
                     status_code=response.status_code,
@@ -70,17 +169,37 @@ class LeonardoClient:
                     response_data=error_data
                 )
             
-            return response.json()
+            return orjson.loads(response.content)
             
+        except orjson.JSONDecodeError as e:
+            raise LeonardoAPIError(
+                status_code=response.status_code,
+                message=f"Invalid JSON response: {e}"
+            )
         except requests.RequestException as e:
             raise LeonardoAPIError(
                 status_code=0,
                 message=f"Network error: {str(e)}"
             )
     
+    @staticmethod
+    def _parse_error_response(response: requests.Response) -> Dict[str, Any]:
+        """Extract error details from a failed response."""
+        body = response.content
+        if "application/json" in response.headers.get("content-type", ""):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        
+        # Non-JSON bodies are usually gateway HTML pages; keep only the head of them
+        text = body[:ERROR_BODY_LIMIT].decode(response.encoding or "utf-8", errors="replace")
+        return {"error": text}
+    
     def post(self, endpoint: str, data: Optional[Dict] = None, **kwargs) -> Dict[str, Any]:
         """POST request."""
-        return self._make_request("POST", endpoint, json=data, **kwargs)
+        body = orjson.dumps(data) if data is not None else None
+        return self._make_request("POST", endpoint, data=body, **kwargs)
     
     def get(self, endpoint: str, params: Optional[Dict] = None, **kwargs) -> Dict[str, Any]:
         """GET request."""
@@ -124,33 +243,47 @@ class LeonardoClient:
             Generation data when complete
         """
         logger.info(f"Polling generation {generation_id}...")
-        start_time = time.time()
         poll_timeout = timeout or self.timeout
+        endpoint = f"/generations/{generation_id}"
+        
+        # Bind loop invariants to locals
+        get = self.get
+        sleep = time.sleep
+        now = time.monotonic
+        poll_interval = self.poll_interval
+        deadline = now() + poll_timeout
         
         while True:
-            if time.time() - start_time > poll_timeout:
+            if now() > deadline:
                 raise LeonardoAPIError(
                     status_code=408,
                     message=f"Polling timeout after {poll_timeout}s"
                 )
             
-            response = self.get(f"/generations/{generation_id}")
-            generation = response.get("generations_by_pk", {})
+            response = get(endpoint)
+            try:
+                generation = response["generations_by_pk"]
+            except KeyError:
+                raise LeonardoAPIError(
+                    status_code=0,
+                    message="Unexpected response format",
+                    response_data=response
+                )
             status = generation.get("status", "PENDING")
             
             logger.debug(f"Generation status: {status}")
             
-            if status == "COMPLETE":
+            if status in _TERMINAL_OK:
                 logger.info("Generation completed successfully")
                 return generation
-            elif status == "FAILED":
+            if status in _TERMINAL_FAIL:
                 raise LeonardoAPIError(
                     status_code=0,
-                    message="Generation failed",
+                    message=f"Generation failed with status {status}",
                     response_data=generation
                 )
             
-            time.sleep(self.poll_interval)
+            sleep(poll_interval)
     
     def download_image(self, url: str) -> bytes:
         """
@@ -165,7 +298,7 @@ class LeonardoClient:
         logger.debug(f"Downloading image: {url}")
         
         try:
-            response = requests.get(url, timeout=self.timeout)
+            response = self._cdn_session.get(url, timeout=self.timeout)
             response.raise_for_status()
             return response.content
         except requests.RequestException as e:
@@ -175,9 +308,33 @@ class LeonardoClient:
                 message=f"Image download failed: {e}"
             )
     
+    def download_images(self, urls: List[str]) -> List[bytes]:
+        """
+        Download several images concurrently.
+        
+        Args:
+            urls: Image URLs
+            
+        Returns:
+            Image data for every successful download, in URL order
+        """
+        def _download(url: str) -> Optional[bytes]:
+            try:
+                return self.download_image(url)
+            except LeonardoAPIError:
+                return None
+        
+        return [image for image in self._download_pool.map(_download, urls) if image is not None]
+    
     def get_user_info(self) -> Dict[str, Any]:
-        """Get user account information."""
-        return self.get("/me")
+        """Get user account information (cached for USER_INFO_TTL seconds)."""
+        now = time.monotonic()
+        if self._user_info_cache is not None and self._user_info_cache[0] > now:
+            return self._user_info_cache[1]
+        
+        user_info = self.get("/me")
+        self._user_info_cache = (now + USER_INFO_TTL, user_info)
+        return user_info
     
     def upscale_image(self, image_id: str, upscale_strength: float = 0.35) -> str:
         """
@@ -199,7 +356,7 @@ class LeonardoClient:
         response = self.post("/generations-upscale", data=payload)
         return response["sdUpscaleJob"]["id"]
     
-    async def generate_photoreal_images(self, photoreal_request) -> Any:
+    async def generate_photoreal_images(self, photoreal_request) -> PhotoRealResult:
         """
         Generate images using Leonardo PhotoReal.
         
@@ -248,10 +405,10 @@ class LeonardoClient:
         logger.debug(f"Payload: {payload}")
         
         # Create generation
-        generation_id = self.create_generation(payload)
+        generation_id = await asyncio.to_thread(self.create_generation, payload)
         
         # Poll until complete
-        generation_data = self.poll_generation(generation_id)
+        generation_data = await asyncio.to_thread(self.poll_generation, generation_id)
         
         # Extract image URLs
         image_urls = []
@@ -260,19 +417,14 @@ class LeonardoClient:
                 image_urls.append(img_data["url"])
         
         # Calculate rough cost estimate for PhotoReal
-        base_cost = 0.025 if photoreal_request.photoreal_version == "v2" else 0.02  # v2 costs slightly more
-        pixel_multiplier = (photoreal_request.width * photoreal_request.height) / (1024 * 1024)
-        cost_estimate = base_cost * photoreal_request.num_outputs * pixel_multiplier
+        cost_estimate = (
+            _PHOTOREAL_COST_PER_PIXEL[photoreal_request.photoreal_version] *
+            photoreal_request.num_outputs *
+            photoreal_request.width *
+            photoreal_request.height
+        )
         
         # Return result in expected format
-        class PhotoRealResult:
-            def __init__(self, generation_id, image_urls, metadata, cost_estimate):
-                self.generation_id = generation_id
-                self.status = "complete"
-                self.image_urls = image_urls
-                self.metadata = metadata
-                self.cost_estimate = cost_estimate
-        
         return PhotoRealResult(
             generation_id=generation_id,
             image_urls=image_urls,
@@ -284,3 +436,24 @@ class LeonardoClient:
             },
             cost_estimate=round(cost_estimate, 4)
         )
+
+
+@lru_cache(maxsize=None)
+def get_client(
+    api_key: str,
+    base_url: str = "https://cloud.leonardo.ai/api/rest/v1",
+    timeout: int = 300,
+    poll_interval: int = 2
+) -> LeonardoClient:
+    """
+    Get a shared Leonardo client for the given settings.
+    
+    Engines configured with the same credentials reuse one client, so they
+    share its HTTP session, connection pool and download pool.
+    """
+    return LeonardoClient(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=timeout,
+        poll_interval=poll_interval
+    )
@@ -5,49 +5,81 @@ Checks for occupied ports, terminates existing processes, and starts the applica
 """
 
 import os
+import shutil
 import sys
 import time
 import subprocess
 import signal
-from pathlib import Path
-from typing import Optional
+import socket
+from typing import Dict, Optional, Set
 
 # Add utils directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'utils'))
 from process_manager import (
-    print_status, Colors, get_processes_by_port, kill_processes_on_port,
-    wait_for_port_clear, is_port_available, get_project_path
+    print_status, print_process_list, Colors, BANNER, get_processes_by_ports, kill_processes_on_port,
+    partition_nymo_processes, wait_for_port_clear, is_port_available, get_project_path
 )
 
 
+# Project layout, resolved once at import
+PROJECT_PATH = get_project_path()
+BACKEND_PATH = os.path.join(PROJECT_PATH, "backend")
+FRONTEND_PATH = os.path.join(PROJECT_PATH, "frontend")
+BACKEND_MAIN = os.path.join(BACKEND_PATH, "app", "main.py")
+FRONTEND_PACKAGE_JSON = os.path.join(FRONTEND_PATH, "package.json")
+
+# Server output goes to log files so a full pipe can never block the servers
+LOGS_PATH = os.path.join(PROJECT_PATH, "logs")
+BACKEND_LOG = os.path.join(LOGS_PATH, "backend.log")
+FRONTEND_LOG = os.path.join(LOGS_PATH, "frontend.log")
+LOG_TAIL_BYTES = 4096
+
+# Prefer the uvicorn console script, resolved once; otherwise run the module
+# with this interpreter
+UVICORN = shutil.which("uvicorn")
+UVICORN_COMMAND = [UVICORN] if UVICORN else [sys.executable, "-m", "uvicorn"]
+
+# Servers started by this script, keyed by display name. They run in their own
+# session and don't see Ctrl+C or a closed terminal, so main() must stop them
+STARTED_SERVICES: Dict[str, subprocess.Popen] = {}
+
+# Ports still held by other processes after ensure_ports_available(). A connect
+# to them doesn't prove our server is up, so startup doesn't probe them
+OCCUPIED_PORTS: Set[int] = set()
+
+# Signals that shut the application down like Ctrl+C does
+SHUTDOWN_SIGNALS = {sig for sig in (getattr(signal, "SIGTERM", None), getattr(signal, "SIGHUP", None)) if sig is not None}
+
+
 def check_dependencies():
     """Check if required dependencies are available."""
     print_status("Checking dependencies...", "INFO")
     
-    project_path = get_project_path()
-    backend_path = os.path.join(project_path, "backend")
-    frontend_path = os.path.join(project_path, "frontend")
+    # List the project directory once instead of stat-ing each subdirectory
+    try:
+        with os.scandir(PROJECT_PATH) as it:
+            directories = {entry.name for entry in it if entry.is_dir()}
+    except OSError:
+        directories = set()
     
     # Check if backend directory exists
-    if not os.path.exists(backend_path):
-        print_status(f"Backend directory not found: {backend_path}", "ERROR")
+    if "backend" not in directories:
+        print_status(f"Backend directory not found: {BACKEND_PATH}", "ERROR")
         return False
     
     # Check if frontend directory exists
-    if not os.path.exists(frontend_path):
-        print_status(f"Frontend directory not found: {frontend_path}", "ERROR")
+    if "frontend" not in directories:
+        print_status(f"Frontend directory not found: {FRONTEND_PATH}", "ERROR")
         return False
     
     # Check if main.py exists in backend
-    main_py = os.path.join(backend_path, "app", "main.py")
-    if not os.path.exists(main_py):
-        print_status(f"Backend main.py not found: {main_py}", "ERROR")
+    if not os.path.exists(BACKEND_MAIN):
+        print_status(f"Backend main.py not found: {BACKEND_MAIN}", "ERROR")
         return False
     
     # Check if package.json exists in frontend
-    package_json = os.path.join(frontend_path, "package.json")
-    if not os.path.exists(package_json):
-        print_status(f"Frontend package.json not found: {package_json}", "ERROR")
+    if not os.path.exists(FRONTEND_PACKAGE_JSON):
+        print_status(f"Frontend package.json not found: {FRONTEND_PACKAGE_JSON}", "ERROR")
         return False
     
     print_status("All dependencies found", "SUCCESS")
@@ -58,25 +90,26 @@ def ensure_ports_available():
     """Ensure required ports are available, clearing Nymo processes if needed."""
     ports = [8000, 5173]  # Backend, Frontend
     
+    # Scan both ports in one go instead of once per port
+    processes_by_port = get_processes_by_ports(ports)
+    
     for port in ports:
         print_status(f"Checking port {port}...", "INFO")
         
-        if is_port_available(port):
+        all_processes = processes_by_port[port]
+        if not all_processes:
             print_status(f"Port {port} is available", "SUCCESS")
             continue
         
         # Port is occupied, check what's using it
-        all_processes = get_processes_by_port(port)
-        nymo_processes = [p for p in all_processes if p.is_nymo_process]
-        non_nymo_processes = [p for p in all_processes if not p.is_nymo_process]
+        nymo_processes, non_nymo_processes = partition_nymo_processes(all_processes)
         
         if nymo_processes:
             print_status(f"Found {len(nymo_processes)} existing Nymo processes on port {port}", "WARNING")
-            for process in nymo_processes:
-                print_status(f"  - PID {process.pid}: {process.full_command[:60]}...", "WARNING")
+            print_process_list(nymo_processes, "WARNING", max_command_length=60)
             
             print_status(f"Terminating existing Nymo processes on port {port}...", "INFO")
-            nymo_killed, _ = kill_processes_on_port(port, kill_non_nymo=False)
+            nymo_killed, _ = kill_processes_on_port(port, kill_non_nymo=False, processes=all_processes)
             
             if nymo_killed > 0:
                 print_status(f"Terminated {nymo_killed} Nymo processes", "SUCCESS")
@@ -87,45 +120,108 @@ def ensure_ports_available():
                 else:
                     # Port might still show as occupied due to system delay or false positives
                     print_status(f"Port {port} still shows as occupied, but continuing anyway", "WARNING")
+                    OCCUPIED_PORTS.add(port)
             else:
                 print_status(f"Failed to clear Nymo processes on port {port}", "ERROR")
                 return False
         
         if non_nymo_processes:
             print_status(f"Found {len(non_nymo_processes)} non-Nymo processes on port {port} (leaving them alone):", "INFO")
-            for process in non_nymo_processes:
-                print_status(f"  - PID {process.pid}: {process.full_command[:60]}...", "INFO")
+            print_process_list(non_nymo_processes, "INFO", max_command_length=60)
             
             # Check if port is still actually blocked after clearing Nymo processes
             time.sleep(1)  # Give a moment for port to be released
             if is_port_available(port):
                 print_status(f"Port {port} is actually available despite process listings", "SUCCESS")
+                OCCUPIED_PORTS.discard(port)
             else:
                 print_status(f"Port {port} is still occupied by non-Nymo processes", "WARNING")
+                OCCUPIED_PORTS.add(port)
                 print_status("Attempting to start anyway - the process may use a different port or these may be false positives", "INFO")
     
     return True
 
 
+def wait_for_port_open(process: subprocess.Popen, port: int, timeout: float = 10.0) -> None:
+    """
+    Wait until a freshly started server accepts connections on its port.
+    
+    Returns early if the process exits, so startup failures show up immediately.
+    If the port was already occupied before launch, a connect could reach the
+    other process, so the conflict is reported instead of probing the port.
+    
+    Args:
+        process: Server process that should bind the port
+        port: Port the server listens on
+        timeout: Maximum seconds to wait
+    """
+    if port in OCCUPIED_PORTS:
+        print_status(f"Port {port} was already in use before launch - cannot confirm the server bound it", "WARNING")
+        # Give a server that fails to bind a moment to exit
+        try:
+            process.wait(timeout=min(timeout, 2.0))
+        except subprocess.TimeoutExpired:
+            pass
+        return
+    
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            with socket.create_connection(("localhost", port), timeout=0.1):
+                pass
+        except OSError:
+            time.sleep(0.05)
+            continue
+        
+        # The connect only counts if our server is still alive to own the port
+        if process.poll() is None:
+            return
+
+
+def open_log(path: str):
+    """Open a server log file for appending, creating the logs directory if needed."""
+    os.makedirs(LOGS_PATH, exist_ok=True)
+    return open(path, "ab")
+
+
+def read_log_tail(path: str, limit: int = LOG_TAIL_BYTES) -> str:
+    """Return the last bytes of a log file for error reporting."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - limit, 0))
+            return f.read().decode("utf-8", errors="replace").strip()
+    except OSError:
+        return ""
+
+
 def start_backend():
     """Start the backend server."""
     print_status("Starting backend server...", "INFO")
     
-    project_path = get_project_path()
-    backend_path = os.path.join(project_path, "backend")
+    command = UVICORN_COMMAND + ["app.main:app", "--host", "0.0.0.0", "--port", "8000"]
+    if os.environ.get("NYMO_DEV"):
+        # Auto-reload keeps a file watcher running, so only use it while developing
+        command.append("--reload")
+    else:
+        # Batch state is kept in memory, so stay on a single worker
+        command += ["--workers", "1"]
     
     try:
         # Change to backend directory and start uvicorn
-        process = subprocess.Popen(
-            ["uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000", "--reload"],
-            cwd=backend_path,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        with open_log(BACKEND_LOG) as log_file:
+            process = subprocess.Popen(
+                command,
+                cwd=BACKEND_PATH,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                # Own process group, so workers and child tools can be stopped together
+                start_new_session=True
+            )
+        STARTED_SERVICES["Backend"] = process
         
-        # Wait a moment to see if it starts successfully
-        time.sleep(3)
+        # Wait until it accepts connections or exits
+        wait_for_port_open(process, 8000)
         
         # Check if process is still running
         if process.poll() is None:
@@ -133,13 +229,12 @@ def start_backend():
             print_status("Backend running on http://localhost:8000", "SUCCESS")
             return process
         else:
-            # Process terminated, get error output
-            stdout, stderr = process.communicate()
+            # Process terminated, show the end of its log
             print_status("Backend server failed to start", "ERROR")
-            if stderr:
-                print_status(f"Error: {stderr}", "ERROR")
-            if stdout:
-                print_status(f"Output: {stdout}", "ERROR")
+            output = read_log_tail(BACKEND_LOG)
+            if output:
+                print_status(f"Output: {output}", "ERROR")
+            print_status(f"Full log: {BACKEND_LOG}", "ERROR")
             return None
             
     except FileNotFoundError:
@@ -154,21 +249,21 @@ def start_frontend():
     """Start the frontend development server."""
     print_status("Starting frontend development server...", "INFO")
     
-    project_path = get_project_path()
-    frontend_path = os.path.join(project_path, "frontend")
-    
     try:
         # Change to frontend directory and start development server
-        process = subprocess.Popen(
-            ["npm", "run", "dev"],
-            cwd=frontend_path,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        with open_log(FRONTEND_LOG) as log_file:
+            process = subprocess.Popen(
+                ["npm", "run", "dev"],
+                cwd=FRONTEND_PATH,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                # Own process group, so workers and child tools can be stopped together
+                start_new_session=True
+            )
+        STARTED_SERVICES["Frontend"] = process
         
-        # Wait a moment to see if it starts successfully
-        time.sleep(5)
+        # Wait until it accepts connections or exits
+        wait_for_port_open(process, 5173)
         
         # Check if process is still running
         if process.poll() is None:
@@ -176,13 +271,12 @@ def start_frontend():
             print_status("Frontend running on http://localhost:5173", "SUCCESS")
             return process
         else:
-            # Process terminated, get error output
-            stdout, stderr = process.communicate()
+            # Process terminated, show the end of its log
             print_status("Frontend development server failed to start", "ERROR")
-            if stderr:
-                print_status(f"Error: {stderr}", "ERROR")
-            if stdout:
-                print_status(f"Output: {stdout}", "ERROR")
+            output = read_log_tail(FRONTEND_LOG)
+            if output:
+                print_status(f"Output: {output}", "ERROR")
+            print_status(f"Full log: {FRONTEND_LOG}", "ERROR")
             return None
             
     except FileNotFoundError:
@@ -193,37 +287,54 @@ def start_frontend():
         return None
 
 
+def wait_until_ready(host: str, port: int, timeout: float = 30.0) -> bool:
+    """
+    Wait for a service to accept TCP connections, probing with exponential backoff.
+    
+    Args:
+        host: Host to connect to
+        port: Port to connect to
+        timeout: Maximum seconds to wait
+    
+    Returns:
+        True if the service accepted a connection before the timeout
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    
+    while True:
+        try:
+            # A completed connect means the server is listening
+            with socket.create_connection((host, port), timeout=0.2):
+                return True
+        except OSError:
+            pass
+        
+        if time.monotonic() + delay > deadline:
+            return False
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+
+
 def wait_for_services():
     """Wait for services to be fully ready."""
     print_status("Waiting for services to start...", "INFO")
     
-    # Wait for backend to be ready
-    backend_ready = False
-    for _ in range(30):  # 30 second timeout
-        try:
-            import urllib.request
-            urllib.request.urlopen("http://localhost:8000/health", timeout=1)
-            backend_ready = True
-            break
-        except:
-            time.sleep(1)
+    # Only needed here, so keep it off the import path of the script
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # Wait for backend and frontend at the same time
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        backend_future = executor.submit(wait_until_ready, "localhost", 8000)
+        frontend_future = executor.submit(wait_until_ready, "localhost", 5173)
+        backend_ready = backend_future.result()
+        frontend_ready = frontend_future.result()
     
     if backend_ready:
         print_status("Backend is ready", "SUCCESS")
     else:
         print_status("Backend health check failed", "WARNING")
     
-    # Wait for frontend to be ready
-    frontend_ready = False
-    for _ in range(30):  # 30 second timeout
-        try:
-            import urllib.request
-            urllib.request.urlopen("http://localhost:5173", timeout=1)
-            frontend_ready = True
-            break
-        except:
-            time.sleep(1)
-    
     if frontend_ready:
         print_status("Frontend is ready", "SUCCESS")
     else:
@@ -232,10 +343,102 @@ def wait_for_services():
     return backend_ready and frontend_ready
 
 
+def wait_for_first_exit(processes: Dict[str, subprocess.Popen]) -> str:
+    """
+    Block until one of the child processes exits.
+    
+    Sleeps in sigwait() until SIGCHLD or a shutdown signal arrives instead of
+    waking up periodically to poll. Ctrl+C, SIGTERM and SIGHUP raise
+    KeyboardInterrupt.
+    
+    Args:
+        processes: Child processes keyed by display name
+    
+    Returns:
+        Name of the process that exited
+    """
+    def exited() -> Optional[str]:
+        for name, process in processes.items():
+            if process.poll() is not None:
+                return name
+        return None
+    
+    if not hasattr(signal, "sigwait"):
+        # No sigwait (Windows), fall back to polling
+        while True:
+            name = exited()
+            if name:
+                return name
+            time.sleep(1)
+    
+    # SIGCHLD is ignored by default, give it a handler so it is always delivered
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    wait_signals = {signal.SIGCHLD, signal.SIGINT} | SHUTDOWN_SIGNALS
+    signal.pthread_sigmask(signal.SIG_BLOCK, wait_signals)
+    try:
+        while True:
+            # Checked before every wait so an exit before blocking isn't missed
+            name = exited()
+            if name:
+                return name
+            if signal.sigwait(wait_signals) != signal.SIGCHLD:
+                raise KeyboardInterrupt
+    finally:
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, wait_signals)
+
+
+def stop_service(process: subprocess.Popen, name: str, timeout: float = 5) -> None:
+    """
+    Stop a server together with every process it spawned.
+    
+    The servers run in their own session, so their process group id is their
+    pid and signalling the group also reaches reloader and worker children.
+    
+    Args:
+        process: Server process started by this script
+        name: Display name for status messages
+        timeout: Seconds to wait after SIGTERM before sending SIGKILL
+    """
+    def signal_group(sig: int) -> None:
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass  # Whole group already gone
+    
+    if not hasattr(os, "killpg"):
+        # No process groups (Windows), only the server itself can be stopped
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=timeout)
+                print_status(f"{name} stopped", "SUCCESS")
+            except subprocess.TimeoutExpired:
+                process.kill()
+                print_status(f"{name} force killed", "WARNING")
+        return
+    
+    signal_group(signal.SIGTERM)
+    try:
+        process.wait(timeout=timeout)
+        print_status(f"{name} stopped", "SUCCESS")
+    except subprocess.TimeoutExpired:
+        signal_group(signal.SIGKILL)
+        process.wait()
+        print_status(f"{name} force killed", "WARNING")
+
+
+def request_shutdown(signum, frame) -> None:
+    """Signal handler that shuts down like Ctrl+C (SIGTERM, terminal closed)."""
+    raise KeyboardInterrupt
+
+
 def main():
     """Main startup function."""
     print_status("🚀 Nymo Art v4 - Application Startup", "HEADER")
-    print_status("=" * 50, "HEADER")
+    print_status(BANNER, "HEADER")
+    
+    for sig in SHUTDOWN_SIGNALS:
+        signal.signal(sig, request_shutdown)
     
     # Check dependencies
     if not check_dependencies():
@@ -247,77 +450,55 @@ def main():
         print_status("❌ Port setup failed", "ERROR")
         sys.exit(1)
     
-    # Start services
-    backend_process = start_backend()
-    if not backend_process:
-        print_status("❌ Backend startup failed", "ERROR")
-        sys.exit(1)
-    
-    frontend_process = start_frontend()
-    if not frontend_process:
-        print_status("❌ Frontend startup failed", "ERROR")
-        # Kill backend if frontend fails
-        backend_process.terminate()
-        sys.exit(1)
-    
-    # Wait for services to be ready
-    services_ready = wait_for_services()
-    
-    # Final status
-    print_status("=" * 50, "HEADER")
-    if services_ready:
-        print_status("✅ Nymo Art v4 started successfully!", "SUCCESS")
-        print_status("", "INFO")
-        print_status("🌐 Frontend: http://localhost:5173", "SUCCESS")
-        print_status("🔧 Backend API: http://localhost:8000", "SUCCESS")
-        print_status("📚 API Docs: http://localhost:8000/docs", "SUCCESS")
-        print_status("", "INFO")
-        print_status("Press Ctrl+C to stop the application", "INFO")
-    else:
-        print_status("⚠️ Services started but health checks failed", "WARNING")
-        print_status("Check the application manually", "WARNING")
-    
-    print_status("=" * 50, "HEADER")
-    
-    # Keep the script running and handle graceful shutdown
+    # From the first server start on, every way out of here stops the servers
+    # again: failures, Ctrl+C, SIGTERM/SIGHUP and unexpected exits
     try:
-        while True:
-            time.sleep(1)
-            
-            # Check if processes are still running
-            if backend_process.poll() is not None:
-                print_status("Backend process terminated unexpectedly", "ERROR")
-                break
-                
-            if frontend_process.poll() is not None:
-                print_status("Frontend process terminated unexpectedly", "ERROR")
-                break
-                
-    except KeyboardInterrupt:
-        print_status("Received shutdown signal", "INFO")
+        # Start services
+        backend_process = start_backend()
+        if not backend_process:
+            print_status("❌ Backend startup failed", "ERROR")
+            sys.exit(1)
         
-        # Graceful shutdown
-        print_status("Stopping services...", "INFO")
+        frontend_process = start_frontend()
+        if not frontend_process:
+            print_status("❌ Frontend startup failed", "ERROR")
+            sys.exit(1)
         
-        if frontend_process.poll() is None:
-            frontend_process.terminate()
-            try:
-                frontend_process.wait(timeout=5)
-                print_status("Frontend stopped", "SUCCESS")
-            except subprocess.TimeoutExpired:
-                frontend_process.kill()
-                print_status("Frontend force killed", "WARNING")
+        # Wait for services to be ready
+        services_ready = wait_for_services()
         
-        if backend_process.poll() is None:
-            backend_process.terminate()
-            try:
-                backend_process.wait(timeout=5)
-                print_status("Backend stopped", "SUCCESS")
-            except subprocess.TimeoutExpired:
-                backend_process.kill()
-                print_status("Backend force killed", "WARNING")
+        # Final status
+        print_status(BANNER, "HEADER")
+        if services_ready:
+            print_status("✅ Nymo Art v4 started successfully!", "SUCCESS")
+            print_status("", "INFO")
+            print_status("🌐 Frontend: http://localhost:5173", "SUCCESS")
+            print_status("🔧 Backend API: http://localhost:8000", "SUCCESS")
+            print_status("📚 API Docs: http://localhost:8000/docs", "SUCCESS")
+            print_status("", "INFO")
+            print_status("Press Ctrl+C to stop the application", "INFO")
+        else:
+            print_status("⚠️ Services started but health checks failed", "WARNING")
+            print_status("Check the application manually", "WARNING")
+        
+        print_status(BANNER, "HEADER")
         
-        print_status("Application stopped", "SUCCESS")
+        # Keep the script running until a server exits or we are told to stop
+        name = wait_for_first_exit({"Backend": backend_process, "Frontend": frontend_process})
+        print_status(f"{name} process terminated unexpectedly", "ERROR")
+        
+    except KeyboardInterrupt:
+        print_status("Received shutdown signal", "INFO")
+        
+    finally:
+        if STARTED_SERVICES:
+            # Graceful shutdown, frontend first
+            print_status("Stopping services...", "INFO")
+            for name, process in reversed(list(STARTED_SERVICES.items())):
+                stop_service(process, name)
+            STARTED_SERVICES.clear()
+            
+            print_status("Application stopped", "SUCCESS")
 
 
 if __name__ == "__main__":
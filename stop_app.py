@@ -5,99 +5,158 @@ Gracefully stops all running instances of the application.
 """
 
 import os
+import shutil
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Add utils directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'utils'))
 from process_manager import (
-    print_status, Colors, cleanup_all_nymo_processes, 
-    kill_processes_on_port, wait_for_port_clear,
-    get_processes_by_port, get_nymo_processes_by_port, 
-    get_non_nymo_processes_by_port
+    print_status, print_process_list, Colors, BANNER, cleanup_all_nymo_processes, find_nymo_processes,
+    kill_processes, wait_for_port_clear, wait_for_exit,
+    get_processes_by_ports, get_nymo_processes_by_port, 
+    get_non_nymo_processes_by_port, partition_nymo_processes, get_project_path
 )
 
+# Python cache directories removed wherever they appear in the project
+TEMP_DIR_NAMES = {"__pycache__", ".pytest_cache"}
+# Directories never searched for temporary files. node_modules holds the Vite
+# dependency caches, which would otherwise have to be rebuilt on every start
+SKIP_DIR_NAMES = {".git", "venv", ".venv", "node_modules"}
+
+
+def _remove_path(path: str) -> bool:
+    """Delete a file or directory tree, returning whether it was removed."""
+    try:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.unlink(path)
+        return True
+    except OSError as e:
+        print_status(f"Could not remove {path}: {e}", "WARNING")
+        return False
+
 
 def cleanup_temp_files():
-    """Clean up temporary files and caches."""
+    """Clean up Python bytecode and test caches."""
     print_status("Cleaning up temporary files...", "INFO")
     
-    # Clean up common temp directories
-    temp_patterns = [
-        "__pycache__",
-        "*.pyc",
-        ".pytest_cache",
-        "node_modules/.cache",
-        ".vite"
-    ]
+    # Walk the project once and match every pattern on the way, instead of
+    # walking the whole tree again for each pattern
+    targets = []
+    for root, dirs, files in os.walk(get_project_path()):
+        search_dirs = []
+        for name in dirs:
+            path = os.path.join(root, name)
+            if name in TEMP_DIR_NAMES:
+                targets.append(path)
+            elif name not in SKIP_DIR_NAMES:
+                search_dirs.append(name)
+        
+        # Don't descend into directories we delete or skip
+        dirs[:] = search_dirs
+        targets.extend(os.path.join(root, name) for name in files if name.endswith(".pyc"))
+    
+    # Deleting is mostly waiting on the filesystem, so remove trees in parallel
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        removed = sum(executor.map(_remove_path, targets))
     
-    # Add specific cleanup logic here if needed
-    print_status("Temporary files cleaned", "SUCCESS")
+    print_status(f"Temporary files cleaned ({removed} removed)", "SUCCESS")
 
 
 def main():
     """Main shutdown function."""
     print_status("🛑 Nymo Art v4 - Application Shutdown", "HEADER")
-    print_status("=" * 50, "HEADER")
+    print_status(BANNER, "HEADER")
     
     # Method 1: Clean up processes by known ports (most reliable)
     ports_to_check = [8000, 5173]  # Backend, Frontend
     total_killed = 0
+    signalled = {}  # pid -> ProcessInfo of everything we sent a signal to
+    
+    # Scan all ports in one go instead of once per port
+    processes_by_port = get_processes_by_ports(ports_to_check)
+    
+    port_nymo_processes = {}
     
     for port in ports_to_check:
         print_status(f"Checking port {port}...", "INFO")
         
         # Get all processes on this port
-        all_processes = get_processes_by_port(port)
-        nymo_processes = [p for p in all_processes if p.is_nymo_process]
-        non_nymo_processes = [p for p in all_processes if not p.is_nymo_process]
+        all_processes = processes_by_port[port]
+        nymo_processes, non_nymo_processes = partition_nymo_processes(all_processes)
         
         if nymo_processes:
             print_status(f"Found {len(nymo_processes)} Nymo processes on port {port}", "INFO")
-            for process in nymo_processes:
-                print_status(f"  - PID {process.pid}: {process.full_command[:60]}...", "INFO")
-            
-            # Kill Nymo processes
-            nymo_killed, _ = kill_processes_on_port(port, kill_non_nymo=False)
-            total_killed += nymo_killed
-            
-            # Wait for port to clear
-            if wait_for_port_clear(port, timeout=5):
-                print_status(f"Port {port} is now clear", "SUCCESS")
-            else:
-                print_status(f"Port {port} still occupied after cleanup", "WARNING")
+            print_process_list(nymo_processes, "INFO", max_command_length=60)
+            port_nymo_processes[port] = nymo_processes
         
         if non_nymo_processes:
             print_status(f"Found {len(non_nymo_processes)} non-Nymo processes on port {port}:", "WARNING")
-            for process in non_nymo_processes:
-                print_status(f"  - PID {process.pid}: {process.full_command[:60]}...", "WARNING")
+            print_process_list(non_nymo_processes, "WARNING", max_command_length=60)
             print_status("Leaving non-Nymo processes alone", "INFO")
         
         if not all_processes:
             print_status(f"Port {port} is already clear", "SUCCESS")
     
+    if port_nymo_processes:
+        # Stop the processes of every port together, so their shutdowns overlap
+        # instead of waiting for one port before signalling the next
+        port_processes = [p for processes in port_nymo_processes.values() for p in processes]
+        total_killed += kill_processes(port_processes)
+        signalled.update((p.pid, p) for p in port_processes)
+        
+        for port in port_nymo_processes:
+            if wait_for_port_clear(port, timeout=5):
+                print_status(f"Port {port} is now clear", "SUCCESS")
+            else:
+                print_status(f"Port {port} still occupied after cleanup", "WARNING")
+    
     # Method 2: Find any remaining Nymo processes not tied to specific ports
     print_status("Scanning for remaining Nymo processes...", "INFO")
-    remaining_killed = cleanup_all_nymo_processes()
+    remaining_processes = find_nymo_processes()
+    remaining_killed = cleanup_all_nymo_processes(remaining_processes)
     total_killed += remaining_killed
+    signalled.update((p.pid, p) for p in remaining_processes)
     
     # Clean up temporary files
     cleanup_temp_files()
     
     # Final status
-    print_status("=" * 50, "HEADER")
+    print_status(BANNER, "HEADER")
     if total_killed > 0:
         print_status(f"✅ Successfully stopped {total_killed} Nymo processes", "SUCCESS")
     else:
         print_status("No Nymo Art processes were running", "SUCCESS")
     
     print_status("Nymo Art v4 application shutdown complete", "SUCCESS")
-    print_status("=" * 50, "HEADER")
+    print_status(BANNER, "HEADER")
+    
+    # Nothing was running and nothing was signalled, so the scans above
+    # already verified the shutdown - skip rescanning every process
+    if not signalled:
+        print_status("✅ Verification: No Nymo Art processes running", "SUCCESS")
+        return
+    
+    # Final verification: give the processes we signalled up to a second to
+    # disappear (cheap per-PID checks). Once all of them are gone there is
+    # nothing left to rescan
+    still_running = wait_for_exit(set(signalled), timeout=1.0)
+    if not still_running:
+        print_status("✅ Verification: No Nymo Art processes running", "SUCCESS")
+        return
     
-    # Final verification
-    time.sleep(1)
+    # Only rescan the ports whose holders are still around, and stop whatever
+    # Nymo processes hold them together with the other stragglers
     print_status("Final verification...", "INFO")
-    final_check = cleanup_all_nymo_processes()
+    stragglers = {pid: signalled[pid] for pid in still_running}
+    straggler_ports = sorted({p.port for p in stragglers.values() if p.port is not None})
+    if straggler_ports:
+        for processes in get_processes_by_ports(straggler_ports).values():
+            nymo_processes, _ = partition_nymo_processes(processes)
+            stragglers.update((p.pid, p) for p in nymo_processes)
+    final_check = cleanup_all_nymo_processes(list(stragglers.values()))
     if final_check == 0:
         print_status("✅ Verification: No Nymo Art processes running", "SUCCESS")
     else:
@@ -0,0 +1,51 @@
+"""
+Regression checks for process detection in utils/process_manager.py.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "utils"))
+import process_manager
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="walks /proc")
+def test_finds_shebang_launched_uvicorn(monkeypatch):
+    """A console-script uvicorn run from the backend directory is a Nymo process."""
+    # Not pytest's tmp_path: "test_" in the command line excludes a process
+    project = tempfile.mkdtemp(prefix="nymo-")
+    venv_bin = tempfile.mkdtemp(prefix="venv-")
+    try:
+        backend = os.path.join(project, "backend")
+        os.makedirs(backend)
+        
+        # Stand-in for the uvicorn console script start_app prefers, installed
+        # outside the project so only the working directory points at it
+        script = os.path.join(venv_bin, "uvicorn")
+        with open(script, "w") as f:
+            f.write(f"#!{sys.executable}\nimport time\ntime.sleep(30)\n")
+        os.chmod(script, 0o755)
+        
+        monkeypatch.setattr(process_manager, "_PROJECT_PATH", project)
+        monkeypatch.setattr(process_manager, "_FRONTEND_PATH", f"{project}/frontend")
+        process_manager._classify_process.cache_clear()
+        
+        process = subprocess.Popen([script, "app.main:app", "--port", "8000"], cwd=backend)
+        try:
+            time.sleep(0.2)  # Let the kernel switch cmdline to the interpreter
+            pids = {p.pid for p in process_manager.find_nymo_processes()}
+        finally:
+            process.kill()
+            process.wait()
+            process_manager._classify_process.cache_clear()
+        
+        assert process.pid in pids
+    finally:
+        shutil.rmtree(project)
+        shutil.rmtree(venv_bin)
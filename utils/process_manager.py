@@ -4,99 +4,133 @@ Nymo Art v4 - Shared Process Management Utilities
 Provides common functionality for process detection, management, and cleanup.
 """
 
+import ctypes
+import io
 import os
+import re
+import select
 import sys
 import time
 import signal
+import socket
 import subprocess
 import platform
-from pathlib import Path
-from typing import List, Dict, Set, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from typing import Dict, Iterable, List, Optional, Set, TextIO, Tuple
+
+try:
+    import psutil
+except ImportError:  # Optional: fall back to lsof/netstat
+    psutil = None
+
+
+# The platform never changes while we run, so look it up once
+_SYSTEM = platform.system()
+_IS_DARWIN = _SYSTEM == "Darwin"
+_IS_LINUX = _SYSTEM == "Linux"
+_IS_POSIX = os.name == "posix"
+
+# macOS: libproc reports a process's working directory without running lsof
+_libproc = None
+if _IS_DARWIN:
+    try:
+        _libproc = ctypes.CDLL("/usr/lib/libproc.dylib", use_errno=True)
+        # int proc_pidinfo(int pid, int flavor, uint64_t arg, void *buffer, int buffersize)
+        _libproc.proc_pidinfo.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_uint64, ctypes.c_void_p, ctypes.c_int]
+        _libproc.proc_pidinfo.restype = ctypes.c_int
+    except OSError:
+        pass
+
+# proc_pidinfo() flavor returning struct proc_vnodepathinfo: the cwd's
+# vnode_info (152 bytes) and path (MAXPATHLEN), then the same for the root dir
+_PROC_PIDVNODEPATHINFO = 9
+_VNODE_INFO_SIZE = 152
+_MAXPATHLEN = 1024
+_PROC_VNODEPATHINFO_SIZE = 2 * (_VNODE_INFO_SIZE + _MAXPATHLEN)
+
+# netstat -tulpn listener row: proto, recv-q, send-q, local addr:port, foreign addr, LISTEN, pid/program
+_NETSTAT_LISTEN_RE = re.compile(rb'tcp6?\s+\d+\s+\d+\s+\S*:(\d+)\s+\S+\s+LISTEN\s+(\d+)/(\S+)')
+
+# One process entry in ss's users:(("name",pid=123,fd=4),...) column
+_SS_USER_RE = re.compile(rb'\("((?:[^"\\]|\\.)*)",pid=(\d+)')
+
+# Commands that could belong to a Nymo process, checked before fetching details
+_CANDIDATE_COMMAND_RE = re.compile(rb'uvicorn|node|npm|vite|python', re.IGNORECASE)
+
+
+# Only emit color codes to a terminal, and honour the NO_COLOR convention
+USE_COLOR = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+
+
+def _ansi(code: str) -> str:
+    """Return the escape code, or an empty string when color is disabled."""
+    return code if USE_COLOR else ""
 
 
 class Colors:
-    """ANSI color codes for terminal output."""
-    HEADER = '\033[95m'
-    OKBLUE = '\033[94m'
-    OKCYAN = '\033[96m'
-    OKGREEN = '\033[92m'
-    WARNING = '\033[93m'
-    FAIL = '\033[91m'
-    ENDC = '\033[0m'
-    BOLD = '\033[1m'
-
-
-def print_status(message: str, status: str = "INFO") -> None:
-    """Print formatted status message."""
-    colors = {
-        "INFO": Colors.OKBLUE,
-        "SUCCESS": Colors.OKGREEN,
-        "WARNING": Colors.WARNING,
-        "ERROR": Colors.FAIL,
-        "HEADER": Colors.HEADER
-    }
-    color = colors.get(status, Colors.OKBLUE)
-    print(f"{color}[{status}]{Colors.ENDC} {message}")
+    """ANSI color codes for terminal output (empty when color is disabled)."""
+    HEADER = _ansi('\033[95m')
+    OKBLUE = _ansi('\033[94m')
+    OKCYAN = _ansi('\033[96m')
+    OKGREEN = _ansi('\033[92m')
+    WARNING = _ansi('\033[93m')
+    FAIL = _ansi('\033[91m')
+    ENDC = _ansi('\033[0m')
+    BOLD = _ansi('\033[1m')
+
+
+STATUS_COLORS = {
+    "INFO": Colors.OKBLUE,
+    "SUCCESS": Colors.OKGREEN,
+    "WARNING": Colors.WARNING,
+    "ERROR": Colors.FAIL,
+    "HEADER": Colors.HEADER
+}
+
+# Separator line printed around the start/stop summaries
+BANNER = "=" * 50
+
+
+def print_status(message: str, status: str = "INFO", file: Optional[TextIO] = None) -> None:
+    """Print formatted status message (to stdout unless another file is given)."""
+    color = STATUS_COLORS.get(status, Colors.OKBLUE)
+    (file if file is not None else sys.stdout).write(f"{color}[{status}]{Colors.ENDC} {message}\n")
+
+
+def print_status_many(messages: Iterable[str], status: str = "INFO") -> None:
+    """Print several formatted status messages, written to stdout in a single call."""
+    buffer = io.StringIO()
+    for message in messages:
+        print_status(message, status, file=buffer)
+    sys.stdout.write(buffer.getvalue())
+
+
+def print_process_list(processes: List["ProcessInfo"], status: str = "INFO", max_command_length: Optional[int] = None) -> None:
+    """Print one status line per process, written to stdout in a single call."""
+    messages = []
+    for process in processes:
+        command = process.full_command
+        if max_command_length is not None:
+            command = f"{command[:max_command_length]}..."
+        messages.append(f"  - PID {process.pid}: {command}")
+    print_status_many(messages, status)
 
 
 class ProcessInfo:
     """Container for process information."""
     def __init__(self, pid: int, command: str, full_command: str, working_dir: str, port: Optional[int] = None):
         self.pid = pid
-        self.command = command
+        # Short names like "node" or "python3" repeat across processes, share one copy
+        self.command = sys.intern(command)
         self.full_command = full_command
         self.working_dir = working_dir
         self.port = port
-        self.is_nymo_process = self._is_nymo_process()
     
-    def _is_nymo_process(self) -> bool:
-        """Determine if this is a legitimate Nymo Art process using ultra-specific criteria."""
-        project_path = get_project_path()
-        
-        # 🚫 EXCLUSIONS: Never consider these as Nymo processes
-        exclusions = [
-            "start_app.py" in self.full_command,
-            "stop_app.py" in self.full_command,
-            "test_" in self.full_command,
-            "pytest" in self.full_command,
-            "__pycache__" in self.full_command,
-        ]
-        
-        if any(exclusions):
-            return False
-        
-        # 🔥 ULTRA-SPECIFIC Nymo process detection
-        nymo_indicators = [
-            # Backend patterns - must have both command AND project path verification
-            (
-                ("uvicorn app.main:app" in self.full_command or "app.main:app" in self.full_command) and
-                (project_path in self.full_command or self.working_dir == project_path)
-            ),
-            
-            # Frontend patterns - must include our specific project path in command
-            (
-                "npm run dev" in self.full_command and 
-                f"{project_path}/frontend" in self.full_command
-            ),
-            
-            # Node.js patterns - must be in our frontend directory
-            (
-                ("node" in self.command.lower() or "vite" in self.full_command) and
-                (self.working_dir.startswith(f"{project_path}/frontend") or 
-                 f"{project_path}/frontend" in self.full_command) and
-                (self.port is not None and self.port == 5173 or "dev" in self.full_command)
-            ),
-            
-            # Python patterns - must be in our project directory with app-related commands (but not management scripts)
-            (
-                "python" in self.command.lower() and
-                project_path in self.working_dir and
-                ("app" in self.full_command or "main" in self.full_command or "uvicorn" in self.full_command) and
-                not any(script in self.full_command for script in ["start_app.py", "stop_app.py", "test_"])
-            )
-        ]
-        
-        return any(nymo_indicators)
+    @cached_property
+    def is_nymo_process(self) -> bool:
+        """Whether this is a legitimate Nymo Art process, classified on first access."""
+        return _classify_process(self.command, self.full_command, self.working_dir, self.port)
     
     def __repr__(self):
         return f"ProcessInfo(pid={self.pid}, command='{self.command}', is_nymo={self.is_nymo_process})"
@@ -107,127 +141,443 @@ def get_project_path() -> str:
     return "/Users/schnebbe/Library/Mobile Documents/com~apple~CloudDocs/01 Nymo/03_NymoArt/30 Scripts/nymo art v4"
 
 
-def get_process_details(pid: int) -> Tuple[str, str]:
-    """Get full command line and working directory for a process."""
+# Resolved once at import instead of for every process we classify
+_PROJECT_PATH = get_project_path()
+_FRONTEND_PATH = f"{_PROJECT_PATH}/frontend"
+
+# What a command line fragment tells us about a process, as bit flags
+_TOKEN_EXCLUDED = 1  # Management scripts and tests are never Nymo processes
+_TOKEN_BACKEND = 2
+_TOKEN_NPM_DEV = 4
+_TOKEN_VITE = 8
+_TOKEN_DEV = 16
+_TOKEN_APP = 32
+
+_NYMO_TOKENS = {
+    "start_app.py": _TOKEN_EXCLUDED,
+    "stop_app.py": _TOKEN_EXCLUDED,
+    "test_": _TOKEN_EXCLUDED,
+    "pytest": _TOKEN_EXCLUDED,
+    "__pycache__": _TOKEN_EXCLUDED,
+    "app.main:app": _TOKEN_BACKEND | _TOKEN_APP,
+    "npm run dev": _TOKEN_NPM_DEV | _TOKEN_DEV,
+    "vite": _TOKEN_VITE,
+    "dev": _TOKEN_DEV,
+    "uvicorn": _TOKEN_APP,
+    "main": _TOKEN_APP,
+    "app": _TOKEN_APP,
+}
+
+# Finds every token in one scan; the lookahead also reports overlapping tokens
+# (e.g. "test_" inside "vitest_"), longest first where several start together
+_NYMO_TOKEN_RE = re.compile(
+    "(?=(%s))" % "|".join(map(re.escape, sorted(_NYMO_TOKENS, key=len, reverse=True)))
+)
+
+
+def _command_tokens(full_command: str) -> int:
+    """Scan a command line once and combine the flags of every token in it."""
+    tokens = 0
+    for match in _NYMO_TOKEN_RE.finditer(full_command):
+        tokens |= _NYMO_TOKENS[match.group(1)]
+    return tokens
+
+
+def _could_be_nymo_command(full_command: str) -> bool:
+    """Cheap check that rules out processes whose command line can never be classified as Nymo processes."""
+    tokens = _command_tokens(full_command)
+    # Every indicator needs at least one of these tokens when no port is known
+    return not tokens & _TOKEN_EXCLUDED and bool(tokens & (_TOKEN_BACKEND | _TOKEN_NPM_DEV | _TOKEN_DEV | _TOKEN_APP))
+
+
+@lru_cache(maxsize=256)
+def _classify_process(command: str, full_command: str, working_dir: str, port: Optional[int]) -> bool:
+    """
+    Determine if a process is a legitimate Nymo Art process using ultra-specific criteria.
+    
+    The result only depends on the arguments, so it is memoized: the same
+    processes come up again in the port scan, the straggler scan and the
+    final verification.
+    """
+    tokens = _command_tokens(full_command)
+    
+    # 🚫 EXCLUSIONS: Never consider these as Nymo processes
+    if tokens & _TOKEN_EXCLUDED:
+        return False
+    
+    command = command.lower()
+    
+    # 🔥 ULTRA-SPECIFIC Nymo process detection, cheapest checks first
+    # Backend patterns - must have both command AND project path verification
+    if tokens & _TOKEN_BACKEND and (_PROJECT_PATH in full_command or working_dir == _PROJECT_PATH):
+        return True
+    
+    in_frontend = _FRONTEND_PATH in full_command
+    
+    # Frontend patterns - must include our specific project path in command
+    if in_frontend and tokens & _TOKEN_NPM_DEV:
+        return True
+    
+    # Node.js patterns - must be in our frontend directory
+    if (
+        ("node" in command or tokens & _TOKEN_VITE) and
+        (in_frontend or working_dir.startswith(_FRONTEND_PATH)) and
+        (port == 5173 or tokens & _TOKEN_DEV)
+    ):
+        return True
+    
+    # Python patterns - must be in our project directory with app-related commands
+    # (management scripts were already excluded above)
+    return bool(
+        "python" in command and
+        _PROJECT_PATH in working_dir and
+        tokens & _TOKEN_APP
+    )
+
+
+def _get_process_details_from_proc(pid: int) -> Tuple[str, str]:
+    """Read full command line and working directory directly from /proc (Linux)."""
     try:
-        # Get full command line
-        ps_result = subprocess.run(
-            ["ps", "-p", str(pid), "-o", "args="],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        
-        full_command = ps_result.stdout.strip() if ps_result.returncode == 0 else ""
-        
-        # Get working directory using lsof (more reliable than pwdx on macOS)
-        lsof_result = subprocess.run(
-            ["lsof", "-p", str(pid)],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        
-        working_dir = ""
-        project_path = get_project_path()
-        
-        if lsof_result.returncode == 0:
-            for line in lsof_result.stdout.split('\n'):
-                if "cwd" in line:
-                    # Extract directory from lsof output
-                    # Format: COMMAND PID USER FD TYPE DEVICE SIZE/OFF NODE NAME
-                    parts = line.split()
-                    if len(parts) >= 9:
-                        potential_dir = " ".join(parts[8:])  # Join in case path has spaces
-                        if os.path.isdir(potential_dir):
-                            working_dir = potential_dir
-                            break
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            # Arguments are NUL-separated, join them like ps does
+            full_command = f.read().rstrip(b"\0").replace(b"\0", b" ").decode(errors="replace")
+    except OSError:
+        return "", ""
+    
+    return full_command, _get_working_dir_from_proc(pid)
+
+
+def _get_working_dir_from_proc(pid: int) -> str:
+    """Read a process's working directory from /proc (Linux)."""
+    try:
+        return os.readlink(f"/proc/{pid}/cwd")
+    except OSError:
+        # Not readable for other users' processes
+        return ""
+
+
+def _get_process_details_from_psutil(pid: int) -> Tuple[str, str]:
+    """Read full command line and working directory through psutil's native APIs."""
+    try:
+        # as_dict() fetches both attributes inside a single oneshot() block
+        info = psutil.Process(pid).as_dict(attrs=["cmdline", "cwd"], ad_value=None)
+    except psutil.Error:
+        return "", ""
+    
+    return " ".join(info["cmdline"] or []), info["cwd"] or ""
+
+
+def _get_working_dir_from_psutil(pid: int) -> str:
+    """Read a process's working directory through psutil."""
+    try:
+        return psutil.Process(pid).cwd()
+    except psutil.Error:
+        return ""
+
+
+def _get_working_dir_from_libproc(pid: int) -> Optional[str]:
+    """Get a process's working directory with a single proc_pidinfo() call (macOS)."""
+    buffer = ctypes.create_string_buffer(_PROC_VNODEPATHINFO_SIZE)
+    size = _libproc.proc_pidinfo(pid, _PROC_PIDVNODEPATHINFO, 0, buffer, _PROC_VNODEPATHINFO_SIZE)
+    if size < _VNODE_INFO_SIZE + _MAXPATHLEN:
+        return None  # Process gone or not ours to inspect
+    
+    path = buffer.raw[_VNODE_INFO_SIZE:_VNODE_INFO_SIZE + _MAXPATHLEN]
+    return path.split(b"\0", 1)[0].decode("utf-8", "replace")
+
+
+def _get_working_dirs_from_lsof(pids: List[int]) -> Dict[int, str]:
+    """Get the working directories of several processes with one lsof call."""
+    working_dirs: Dict[int, str] = {}
+    try:
+        # Only the cwd descriptor, printed as p<pid>/n<path> field records
+        with subprocess.Popen(
+            ["lsof", "-a", "-d", "cwd", "-p", ",".join(map(str, pids)), "-Fn"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        ) as lsof:
+            pid = None
+            for line in lsof.stdout:
+                if line.startswith("p"):
+                    pid = int(line[1:])
+                elif line.startswith("n") and pid is not None:
+                    working_dirs[pid] = line[1:].rstrip("\n")
         
-        return full_command, working_dir
+    except Exception as e:
+        print_status(f"Error getting working directories for PIDs {pids}: {e}", "WARNING")
+    
+    return working_dirs
+
+
+def _get_commands_from_ps(pids: List[int]) -> Dict[int, str]:
+    """Get the full command lines of several processes with one ps call."""
+    commands: Dict[int, str] = {}
+    try:
+        with subprocess.Popen(
+            ["ps", "-p", ",".join(map(str, pids)), "-ww", "-o", "pid=,args="],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        ) as ps:
+            for line in ps.stdout:
+                pid_text, _, args = line.strip().partition(" ")
+                try:
+                    commands[int(pid_text)] = args.strip()
+                except ValueError:
+                    continue
         
     except Exception as e:
-        print_status(f"Error getting process details for PID {pid}: {e}", "WARNING")
-        return "", ""
+        print_status(f"Error getting process details for PIDs {pids}: {e}", "WARNING")
+    
+    return commands
 
 
-def get_processes_by_port(port: int) -> List[ProcessInfo]:
-    """Get all processes using a specific port, with Nymo/non-Nymo classification."""
-    processes = []
+def get_working_dirs(pids: Iterable[int]) -> Dict[int, str]:
+    """
+    Get the working directory of several processes at once.
+    
+    Args:
+        pids: Process IDs to look up
+    
+    Returns:
+        Dict mapping each PID to its working directory; empty string if unknown
+    """
+    pids = sorted(set(pids))
+    
+    if _IS_LINUX:
+        return {pid: _get_working_dir_from_proc(pid) for pid in pids}
     
+    if psutil is not None:
+        return {pid: _get_working_dir_from_psutil(pid) for pid in pids}
+    
+    working_dirs: Dict[int, str] = {}
+    if _libproc is not None:
+        for pid in pids:
+            working_dir = _get_working_dir_from_libproc(pid)
+            if working_dir is not None:
+                working_dirs[pid] = working_dir
+    
+    # Whatever libproc couldn't answer is looked up with a single lsof call
+    missing = [pid for pid in pids if pid not in working_dirs]
+    if missing:
+        working_dirs.update(_get_working_dirs_from_lsof(missing))
+    
+    return {pid: working_dirs.get(pid, "") for pid in pids}
+
+
+def get_processes_details(pids: Iterable[int]) -> Dict[int, Tuple[str, str]]:
+    """
+    Get full command line and working directory for several processes at once.
+    
+    Args:
+        pids: Process IDs to look up
+    
+    Returns:
+        Dict mapping each PID to (full_command, working_dir); empty strings if unknown
+    """
+    pids = sorted(set(pids))
+    if not pids:
+        return {}
+    
+    if _IS_LINUX:
+        # No need to fork ps/lsof when /proc has everything
+        return {pid: _get_process_details_from_proc(pid) for pid in pids}
+    
+    if psutil is not None:
+        # psutil asks the OS directly, no ps/lsof processes needed
+        return {pid: _get_process_details_from_psutil(pid) for pid in pids}
+    
+    # The ps and lsof lookups are independent subprocesses, so let ps run in
+    # a worker thread while the working directories are fetched
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        commands_future = executor.submit(_get_commands_from_ps, pids)
+        working_dirs = get_working_dirs(pids)
+        commands = commands_future.result()
+    
+    return {pid: (commands.get(pid, ""), working_dirs[pid]) for pid in pids}
+
+
+def get_process_details(pid: int) -> Tuple[str, str]:
+    """Get full command line and working directory for a process."""
+    return get_processes_details([pid])[pid]
+
+
+def _port_from_address(address: bytes) -> Optional[int]:
+    """Extract the port from raw lsof/ss output such as b'*:8000' or b'[::1]:8000'."""
     try:
-        if platform.system() == "Darwin":  # macOS
-            # Use lsof to get detailed process info
-            result = subprocess.run(
-                ["lsof", "-i", f":{port}", "-P"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
+        # int() parses the ASCII digits straight from bytes, no decoding needed
+        return int(address.rpartition(b':')[2])
+    except ValueError:
+        return None
+
+
+def _port_in_use(port: int) -> bool:
+    """
+    Cheaply check whether anything is bound to a port by trying to bind it.
+    
+    Binds the IPv4 and IPv6 wildcard addresses, which conflict with a listener
+    on any specific address too. On POSIX systems SO_REUSEADDR is set like
+    uvicorn and vite do, so TIME_WAIT connections left by the previous run don't
+    count as in use. On Windows it would allow binding over a live listener, so
+    it stays off there.
+    """
+    for family, address in ((socket.AF_INET, "0.0.0.0"), (socket.AF_INET6, "::")):
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError:
+            continue  # No IPv6 support
+        try:
+            if _IS_POSIX:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if family == socket.AF_INET6:
+                sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+            sock.bind((address, port))
+        except OSError:
+            return True
+        finally:
+            sock.close()
+    return False
+
+
+def _build_port_processes(
+    processes: Dict[int, List[ProcessInfo]],
+    found: List[Tuple[int, int, str]]
+) -> Dict[int, List[ProcessInfo]]:
+    """Fill the per-port lists from (port, pid, command) tuples, looking up all PIDs in one batch."""
+    details = get_processes_details(pid for _, pid, _ in found)
+    for port, pid, command in found:
+        full_command, working_dir = details[pid]
+        processes[port].append(ProcessInfo(
+            pid=pid,
+            command=command,
+            full_command=full_command,
+            working_dir=working_dir,
+            port=port
+        ))
+    return processes
+
+
+def get_processes_by_ports(ports: Iterable[int]) -> Dict[int, List[ProcessInfo]]:
+    """
+    Get all processes using any of the given ports with a single lsof/netstat call.
+    
+    Args:
+        ports: Port numbers to look up
+    
+    Returns:
+        Dict mapping every requested port to the processes using it (empty list if free)
+    """
+    processes: Dict[int, List[ProcessInfo]] = {port: [] for port in ports}
+    
+    # Ports we can bind ourselves are free, so only those that can't need a scan
+    ports_in_use = {port for port in processes if _port_in_use(port)}
+    if not ports_in_use:
+        return processes
+    
+    # (port, pid, command) per listener; details are fetched for all PIDs at the end
+    found: List[Tuple[int, int, str]] = []
+    seen: Set[Tuple[int, int]] = set()
+    
+    def add_process(port: int, pid: int, command: str) -> None:
+        # A process shows up once per socket (e.g. IPv4 and IPv6), list it once per port
+        if (port, pid) not in seen:
+            seen.add((port, pid))
+            found.append((port, pid, command))
+    
+    if psutil is not None:
+        try:
+            # Read the socket table in-process instead of forking lsof/netstat
+            listeners = [
+                (conn.laddr.port, conn.pid)
+                for conn in psutil.net_connections(kind='inet')
+                if conn.status == psutil.CONN_LISTEN and conn.pid is not None
+                and conn.laddr and conn.laddr.port in ports_in_use
+            ]
+            for port, pid in listeners:
+                try:
+                    command = psutil.Process(pid).name()
+                except psutil.Error:
+                    continue
+                add_process(port, pid, command)
+            return _build_port_processes(processes, found)
+        except psutil.AccessDenied:
+            # macOS needs root for a full socket table, use lsof instead
+            pass
+    
+    try:
+        if _IS_DARWIN:  # macOS
+            # One lsof call with an -i filter per port (lsof ORs them together),
+            # in field mode: p<pid> and c<command> per process, n<address> per file
+            lsof_args = ["lsof", "-nP", "-Fpcn"]
+            for port in ports_in_use:
+                lsof_args += ["-i", f":{port}"]
             
-            if result.returncode == 0 and result.stdout.strip():
-                lines = result.stdout.strip().split('\n')[1:]  # Skip header
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) >= 10:
-                        try:
-                            pid = int(parts[1])
-                            command = parts[0]
-                            
-                            # Get detailed process information
-                            full_command, working_dir = get_process_details(pid)
-                            
-                            process_info = ProcessInfo(
-                                pid=pid,
-                                command=command,
-                                full_command=full_command,
-                                working_dir=working_dir,
-                                port=port
-                            )
-                            
-                            processes.append(process_info)
-                            
-                        except (ValueError, IndexError) as e:
-                            print_status(f"Error parsing lsof line: {line} - {e}", "WARNING")
+            # Parse records as lsof produces them instead of buffering all output;
+            # they stay bytes and only the command name is ever decoded
+            with subprocess.Popen(lsof_args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as lsof:
+                pid = None
+                command = ""
+                for line in lsof.stdout:
+                    field, value = line[:1], line[1:].rstrip(b"\n")
+                    if field == b"p":
+                        pid = int(value)
+                        command = ""
+                    elif field == b"c":
+                        command = value.decode(errors="replace")
+                    elif field == b"n" and pid is not None:
+                        # Address is 'host:port' or 'local:port->remote:port'
+                        for address in value.split(b"->"):
+                            port = _port_from_address(address)
+                            if port in ports_in_use:
+                                add_process(port, pid, command)
+                                break
         else:
-            # Linux/other systems
-            result = subprocess.run(
-                ["netstat", "-tulpn"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
+            # Linux: let ss filter on the ports so only our listeners come back
+            port_filter = " or ".join(f"sport = :{port}" for port in ports_in_use)
+            try:
+                ss = subprocess.Popen(["ss", "-Htlnp", f"( {port_filter} )"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            except FileNotFoundError:
+                ss = None
             
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if f":{port}" in line and "LISTEN" in line:
-                        # Extract PID from netstat output
-                        parts = line.split()
-                        if len(parts) >= 7:
-                            pid_info = parts[6]
-                            if '/' in pid_info:
-                                try:
-                                    pid = int(pid_info.split('/')[0])
-                                    command = pid_info.split('/')[1]
-                                    
-                                    full_command, working_dir = get_process_details(pid)
-                                    
-                                    process_info = ProcessInfo(
-                                        pid=pid,
-                                        command=command,
-                                        full_command=full_command,
-                                        working_dir=working_dir,
-                                        port=port
-                                    )
-                                    
-                                    processes.append(process_info)
-                                    
-                                except (ValueError, IndexError) as e:
-                                    print_status(f"Error parsing netstat line: {line} - {e}", "WARNING")
+            if ss is not None:
+                with ss:
+                    for line in ss.stdout:
+                        # State, Recv-Q, Send-Q, local addr:port, peer, users:((...))
+                        parts = line.split(None, 5)
+                        if len(parts) == 6:
+                            port = _port_from_address(parts[3])
+                            if port in ports_in_use:
+                                for command, pid in _SS_USER_RE.findall(parts[5]):
+                                    add_process(port, int(pid), command.decode(errors="replace"))
+            else:
+                # No ss (other systems), parsed line by line as netstat produces them
+                with subprocess.Popen(["netstat", "-tulpn"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as netstat:
+                    for line in netstat.stdout:
+                        match = _NETSTAT_LISTEN_RE.match(line)
+                        if match:
+                            port = int(match.group(1))
+                            if port in ports_in_use:
+                                add_process(port, int(match.group(2)), match.group(3).decode(errors="replace"))
     
     except Exception as e:
-        print_status(f"Error checking port {port}: {e}", "ERROR")
+        print_status(f"Error checking ports {', '.join(map(str, processes))}: {e}", "ERROR")
     
-    return processes
+    return _build_port_processes(processes, found)
+
+
+def get_processes_by_port(port: int) -> List[ProcessInfo]:
+    """Get all processes using a specific port, with Nymo/non-Nymo classification."""
+    return get_processes_by_ports([port])[port]
+
+
+def partition_nymo_processes(processes: Iterable[ProcessInfo]) -> Tuple[List[ProcessInfo], List[ProcessInfo]]:
+    """Split processes into (nymo_processes, non_nymo_processes) in a single pass."""
+    nymo_processes: List[ProcessInfo] = []
+    non_nymo_processes: List[ProcessInfo] = []
+    for process_info in processes:
+        (nymo_processes if process_info.is_nymo_process else non_nymo_processes).append(process_info)
+    return nymo_processes, non_nymo_processes
 
 
 def get_nymo_processes_by_port(port: int) -> List[ProcessInfo]:
@@ -250,20 +600,16 @@ def kill_process(process_info: ProcessInfo, signal_type: int = signal.SIGTERM) -
         # Send the signal
         os.kill(process_info.pid, signal_type)
         
-        # Wait a bit for graceful shutdown
-        time.sleep(1)
-        
-        # Check if process is still running
-        try:
-            os.kill(process_info.pid, 0)  # Signal 0 just checks if process exists
-            if signal_type == signal.SIGTERM:
-                # Process still running, try SIGKILL
-                print_status(f"Process {process_info.pid} still running, sending SIGKILL", "WARNING")
+        # Wait up to a second for graceful shutdown, returning as soon as it exits
+        if wait_for_exit({process_info.pid}, timeout=1.0) and signal_type == signal.SIGTERM:
+            # Process still running, try SIGKILL
+            print_status(f"Process {process_info.pid} still running, sending SIGKILL", "WARNING")
+            try:
                 os.kill(process_info.pid, signal.SIGKILL)
-                time.sleep(0.5)
-        except ProcessLookupError:
-            # Process is gone, which is what we want
-            pass
+                wait_for_exit({process_info.pid}, timeout=0.5)
+            except ProcessLookupError:
+                # Process is gone, which is what we want
+                pass
         
         print_status(f"Successfully terminated process {process_info.pid}", "SUCCESS")
         return True
@@ -279,114 +625,342 @@ def kill_process(process_info: ProcessInfo, signal_type: int = signal.SIGTERM) -
         return False
 
 
-def kill_processes_on_port(port: int, kill_non_nymo: bool = False) -> Tuple[int, int]:
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process still exists (signal 0 only checks)."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _wait_for_exit_pidfd(pids: Set[int], deadline: float) -> Optional[Set[int]]:
+    """Wait on Linux pidfds; returns None if the kernel doesn't support them."""
+    fds: Dict[int, int] = {}
+    try:
+        for pid in pids:
+            try:
+                fds[os.pidfd_open(pid)] = pid
+            except ProcessLookupError:
+                pass  # Already gone
+        
+        # A pidfd becomes readable once its process has exited
+        poller = select.poll()
+        for fd in fds:
+            poller.register(fd, select.POLLIN)
+        
+        alive = set(fds.values())
+        while alive:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for fd, _ in poller.poll(remaining * 1000):
+                poller.unregister(fd)
+                alive.discard(fds[fd])
+        return alive
+    except OSError:
+        return None
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def _wait_for_exit_kqueue(pids: Set[int], deadline: float) -> Optional[Set[int]]:
+    """Wait on macOS/BSD kqueue NOTE_EXIT events; returns None if they can't be watched."""
+    kq = select.kqueue()
+    try:
+        alive = set()
+        for pid in pids:
+            event = select.kevent(
+                pid,
+                filter=select.KQ_FILTER_PROC,
+                flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                fflags=select.KQ_NOTE_EXIT
+            )
+            try:
+                kq.control([event], 0, 0)
+                alive.add(pid)
+            except ProcessLookupError:
+                pass  # Already gone
+        
+        while alive:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for event in kq.control(None, len(alive), remaining):
+                alive.discard(event.ident)
+        return alive
+    except OSError:
+        return None
+    finally:
+        kq.close()
+
+
+def _wait_for_exit_polling(pids: Set[int], deadline: float) -> Set[int]:
+    """Poll with signal 0 until the processes are gone or the deadline passes."""
+    alive = set(pids)
+    while alive and time.monotonic() < deadline:
+        time.sleep(0.05)
+        alive = {pid for pid in alive if _pid_alive(pid)}
+    return alive
+
+
+# Pick the event-driven wait this platform supports once, not on every call
+if hasattr(os, "pidfd_open"):
+    _wait_for_exit_events = _wait_for_exit_pidfd
+elif hasattr(select, "kqueue"):
+    _wait_for_exit_events = _wait_for_exit_kqueue
+else:
+    _wait_for_exit_events = None
+
+
+def wait_for_exit(pids: Set[int], timeout: float) -> Set[int]:
+    """
+    Wait for processes to exit.
+    
+    On Linux the wait blocks on pidfds and on macOS on kqueue exit events, so
+    it returns as soon as the last process is gone; elsewhere it falls back to
+    polling with signal 0.
+    
+    Args:
+        pids: PIDs to wait for
+        timeout: Maximum seconds to wait
+    
+    Returns:
+        PIDs still running when the timeout expired
+    """
+    deadline = time.monotonic() + timeout
+    
+    if _wait_for_exit_events is not None:
+        alive = _wait_for_exit_events(pids, deadline)
+        if alive is not None:
+            return alive
+    
+    return _wait_for_exit_polling(pids, deadline)
+
+
+# Process groups are POSIX-only; our own group is never signalled as a whole
+_OWN_PROCESS_GROUP = os.getpgrp() if hasattr(os, "killpg") else None
+
+
+def _signal_process_group(pid: int, sig: int) -> None:
+    """
+    Send a signal to a process, or to its whole process group if it leads one.
+    
+    npm and uvicorn leave children (vite, reloader workers) behind when only the
+    parent is signalled, and a group leader's group is exactly that tree.
+    """
+    if _OWN_PROCESS_GROUP is not None and pid != _OWN_PROCESS_GROUP:
+        try:
+            is_group_leader = os.getpgid(pid) == pid
+        except OSError:
+            # Can't look up the group (e.g. no permission), so let os.kill below
+            # signal the process itself and report the real outcome
+            is_group_leader = False
+        if is_group_leader:
+            os.killpg(pid, sig)
+            return
+    os.kill(pid, sig)
+
+
+def kill_processes(processes: List[ProcessInfo], timeout: float = 2.0) -> int:
+    """
+    Terminate several processes at once.
+    
+    All processes get SIGTERM up front and are then waited for together, so
+    shutdown takes at most one timeout instead of one pause per process.
+    
+    Args:
+        processes: Processes to terminate
+        timeout: Seconds to wait for graceful shutdown before sending SIGKILL
+    
+    Returns:
+        Number of processes that were terminated
+    """
+    pending: Dict[int, ProcessInfo] = {}
+    terminated = 0
+    
+    for process_info in processes:
+        if process_info.pid in pending:
+            continue
+        
+        try:
+            print_status(f"Terminating process {process_info.pid} ({process_info.command})", "INFO")
+            _signal_process_group(process_info.pid, signal.SIGTERM)
+            pending[process_info.pid] = process_info
+        except ProcessLookupError:
+            print_status(f"Process {process_info.pid} was already terminated", "INFO")
+            terminated += 1
+        except PermissionError:
+            print_status(f"Permission denied to terminate process {process_info.pid}", "ERROR")
+        except Exception as e:
+            print_status(f"Error terminating process {process_info.pid}: {e}", "ERROR")
+    
+    # Wait for graceful shutdown of all processes together
+    alive = wait_for_exit(set(pending), timeout)
+    
+    for pid in alive:
+        print_status(f"Process {pid} still running, sending SIGKILL", "WARNING")
+        try:
+            _signal_process_group(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        except Exception as e:
+            print_status(f"Error terminating process {pid}: {e}", "ERROR")
+            del pending[pid]
+    
+    print_status_many((f"Successfully terminated process {pid}" for pid in pending), "SUCCESS")
+    
+    return terminated + len(pending)
+
+
+def kill_processes_on_port(
+    port: int,
+    kill_non_nymo: bool = False,
+    processes: Optional[List[ProcessInfo]] = None
+) -> Tuple[int, int]:
     """
     Kill processes on a specific port.
     
     Args:
         port: Port number to clear
         kill_non_nymo: If True, also kill non-Nymo processes (with warning)
+        processes: Processes already found on the port (e.g. from
+            get_processes_by_ports), to avoid scanning the port again
     
     Returns:
         Tuple of (nymo_processes_killed, non_nymo_processes_killed)
     """
-    all_processes = get_processes_by_port(port)
-    nymo_processes = [p for p in all_processes if p.is_nymo_process]
-    non_nymo_processes = [p for p in all_processes if not p.is_nymo_process]
+    all_processes = processes if processes is not None else get_processes_by_port(port)
+    nymo_processes, non_nymo_processes = partition_nymo_processes(all_processes)
     
-    nymo_killed = 0
     non_nymo_killed = 0
     
     # Always kill Nymo processes
-    for process in nymo_processes:
-        if kill_process(process):
-            nymo_killed += 1
+    nymo_killed = kill_processes(nymo_processes)
     
     # Handle non-Nymo processes
     if non_nymo_processes:
         if kill_non_nymo:
             print_status(f"WARNING: Found {len(non_nymo_processes)} non-Nymo processes on port {port}:", "WARNING")
-            for process in non_nymo_processes:
-                print_status(f"  - PID {process.pid}: {process.full_command}", "WARNING")
+            print_process_list(non_nymo_processes, "WARNING")
             
             response = input(f"Kill these non-Nymo processes? (y/N): ").strip().lower()
             if response == 'y':
-                for process in non_nymo_processes:
-                    if kill_process(process):
-                        non_nymo_killed += 1
+                non_nymo_killed = kill_processes(non_nymo_processes)
             else:
                 print_status("Skipping non-Nymo processes", "INFO")
         else:
             print_status(f"Found {len(non_nymo_processes)} non-Nymo processes on port {port} (leaving them alone):", "INFO")
-            for process in non_nymo_processes:
-                print_status(f"  - PID {process.pid}: {process.full_command}", "INFO")
+            print_process_list(non_nymo_processes, "INFO")
     
     return nymo_killed, non_nymo_killed
 
 
 def is_port_available(port: int) -> bool:
-    """Check if a port is available (no processes using it)."""
-    processes = get_processes_by_port(port)
-    return len(processes) == 0
+    """Check if a port is available, i.e. a server could bind it right now (no subprocesses)."""
+    return not _port_in_use(port)
 
 
 def wait_for_port_clear(port: int, timeout: int = 10) -> bool:
-    """Wait for a port to become available."""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        if is_port_available(port):
+    """
+    Wait for a port to become available.
+    
+    Instead of re-scanning the port on an interval, this blocks until the
+    processes holding it exit and only scans again afterwards.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        processes = get_processes_by_port(port)
+        if not processes:
             return True
-        time.sleep(0.5)
-    return False
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or wait_for_exit({p.pid for p in processes}, remaining):
+            return False
+
+
+def _iter_proc_candidates() -> Iterable[Tuple[int, str, str]]:
+    """Yield (pid, command name, command line) for possible Nymo processes listed in /proc."""
+    with os.scandir("/proc") as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                    raw = f.read()
+                
+                # Match on the raw bytes so unrelated processes are never decoded
+                # (kernel threads have an empty cmdline and never match)
+                if not _CANDIDATE_COMMAND_RE.search(raw):
+                    continue
+            except OSError:
+                continue  # Process exited while we were scanning
+            
+            # The command is argv[0], like ps reports it. comm would be the script
+            # name for console scripts (e.g. "uvicorn" instead of the interpreter)
+            command = raw.split(b"\0", 1)[0].decode("utf-8", "replace")
+            yield int(entry.name), command, raw.rstrip(b"\0").replace(b"\0", b" ").decode("utf-8", "replace")
+
+
+def _iter_ps_candidates() -> Iterable[Tuple[int, str, str]]:
+    """Yield (pid, command name, command line) for possible Nymo processes reported by ps."""
+    # Only the two columns we use, with ww so the command is never truncated.
+    # Lines are read as ps produces them and stay bytes so only the matching
+    # ones get decoded
+    with subprocess.Popen(
+        ["ps", "-axwwo", "pid=,command="],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    ) as ps:
+        for line in ps.stdout:
+            if not _CANDIDATE_COMMAND_RE.search(line):
+                continue
+            
+            parts = line.decode("utf-8", "replace").split(None, 1)  # pid, command line
+            if len(parts) == 2:
+                try:
+                    yield int(parts[0]), parts[1].split(None, 1)[0], parts[1].rstrip()
+                except ValueError:
+                    continue
 
 
 def find_nymo_processes() -> List[ProcessInfo]:
     """Find all running Nymo processes (not tied to specific ports)."""
     processes = []
-    project_path = get_project_path()
     
     try:
-        # Get all running processes
-        if platform.system() == "Darwin":  # macOS
-            result = subprocess.run(
-                ["ps", "aux"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-        else:  # Linux
-            result = subprocess.run(
-                ["ps", "aux"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
+        # On Linux walk /proc directly instead of formatting a full ps table.
+        # Both only return processes that might be related (quick filter)
+        if _IS_LINUX:
+            candidates = _iter_proc_candidates()
+        else:
+            candidates = _iter_ps_candidates()
         
-        if result.returncode == 0:
-            lines = result.stdout.strip().split('\n')[1:]  # Skip header
-            for line in lines:
-                parts = line.split(None, 10)  # Split on whitespace, max 11 parts
-                if len(parts) >= 11:
-                    try:
-                        pid = int(parts[1])
-                        command = parts[10]  # Full command line
-                        
-                        # Quick filter - only check processes that might be related
-                        if any(keyword in command.lower() for keyword in ['uvicorn', 'node', 'npm', 'vite', 'python']):
-                            full_command, working_dir = get_process_details(pid)
-                            
-                            process_info = ProcessInfo(
-                                pid=pid,
-                                command=parts[10].split()[0] if parts[10] else "",
-                                full_command=full_command,
-                                working_dir=working_dir
-                            )
-                            
-                            if process_info.is_nymo_process:
-                                processes.append(process_info)
-                                
-                    except (ValueError, IndexError):
-                        continue
+        # Skip unrelated python/node processes before looking up their details
+        candidates = [
+            (pid, command, command_line)
+            for pid, command, command_line in candidates
+            if _could_be_nymo_command(command_line)
+        ]
+        
+        # The listing already gave us the full command line, only the working
+        # directories are still missing
+        working_dirs = get_working_dirs(pid for pid, _, _ in candidates)
+        
+        for pid, command, command_line in candidates:
+            process_info = ProcessInfo(
+                pid=pid,
+                command=command,
+                full_command=command_line,
+                working_dir=working_dirs[pid]
+            )
+            
+            if process_info.is_nymo_process:
+                processes.append(process_info)
     
     except Exception as e:
         print_status(f"Error finding Nymo processes: {e}", "ERROR")
@@ -394,21 +968,16 @@ def find_nymo_processes() -> List[ProcessInfo]:
     return processes
 
 
-def cleanup_all_nymo_processes() -> int:
-    """Find and terminate all Nymo processes."""
-    processes = find_nymo_processes()
-    killed_count = 0
+def cleanup_all_nymo_processes(processes: Optional[List[ProcessInfo]] = None) -> int:
+    """Find and terminate all Nymo processes (or the given, already found ones)."""
+    if processes is None:
+        processes = find_nymo_processes()
     
     if not processes:
         print_status("No running Nymo processes found", "INFO")
         return 0
     
     print_status(f"Found {len(processes)} Nymo processes:", "INFO")
-    for process in processes:
-        print_status(f"  - PID {process.pid}: {process.full_command}", "INFO")
-    
-    for process in processes:
-        if kill_process(process):
-            killed_count += 1
+    print_process_list(processes, "INFO")
     
-    return killed_count
+    return kill_processes(processes)